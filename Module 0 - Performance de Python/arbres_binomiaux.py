@@ -18,16 +18,23 @@ Voici différentes manières de construire un arbre binomial :
 - Exercice 4 : Variante de l'arbre binomial avec Cython (A venir)
 - Exercice 5 : Affichage graphique de l'arbre binomial avec Matplotlib
 - Exercice 6 : Valorisation d'options européennes, comparaison avec Black-Scholes-Merton
+- Exercice 7 : Valorisation économe en mémoire (O(M)) par backward induction vectorisée
+- Exercice 8 : Valorisation groupée d'une chaîne d'options en un seul appel (treillis 2D option x nœud)
+- Exercice 9 : Exercice anticipé (options américaines et bermudéennes) et moteur de treillis Numba parallèle
+- Exercice 10 : Arbres à convergence accélérée (Leisen-Reimer, extrapolation de Richardson) et rapport convergence / temps
+- Exercice 11 : Grecques (delta, gamma, theta, vega, rho) extraites d'une seule backward induction
+- Exercice 12 : Black-Scholes-Merton vectorisé avec grecques sur des tableaux
 '''
 
-
-
 import math
 import time
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 import numba
 from scipy.stats import norm
+from scipy.special import ndtr
+from compilation_numba import compile_kernel, compilation_report
 
 
 '''
@@ -36,10 +43,6 @@ Contrairement à ce qui se produit dans un tracé typique d'arbre, le mouvement
 Cela fait diminuer la taille de ndarray, et rend plus facile la construction de l'arbre.
 '''
 
-print("\n" + "="*70)
-print("Exercice 1 : CONSTRUCTION D'UN ARBRE BINOMIAL - PYTHON PUR")
-print("="*70)
-
 # Valeur initiale de l'actif risqué 
 S0 = 36.
 # Horizon temporel de la simulation d'arbre binomial
@@ -67,16 +70,21 @@ def simulate_tree(M):
         z += 1
     return S
 
-# Affichage graphique de l'arbre binomial, set_printoptions pour un affichage plus lisible des prix dans l'arbre
-np.set_printoptions(formatter={'float': lambda x: '%6.2f' % x})
-# Arbre avec 4 intervalles temporels
-print("Arbre binomial avec 4 périodes :")
-print(simulate_tree(4))
-# Arbre avec 500 intervalles temporels
-print("\nArbre binomial avec 500 périodes :")
-t0 = time.time()
-print(simulate_tree(500))
-print(f"Temps d'exécution pour 500 périodes : {time.time() - t0:.5f} secondes")
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 1 : CONSTRUCTION D'UN ARBRE BINOMIAL - PYTHON PUR")
+    print("="*70)
+
+    # Affichage graphique de l'arbre binomial, set_printoptions pour un affichage plus lisible des prix dans l'arbre
+    np.set_printoptions(formatter={'float': lambda x: '%6.2f' % x})
+    # Arbre avec 4 intervalles temporels
+    print("Arbre binomial avec 4 périodes :")
+    print(simulate_tree(4))
+    # Arbre avec 500 intervalles temporels
+    print("\nArbre binomial avec 500 périodes :")
+    t0 = time.time()
+    print(simulate_tree(500))
+    print(f"Temps d'exécution pour 500 périodes : {time.time() - t0:.5f} secondes")
 
 
 
@@ -85,35 +93,6 @@ print(f"Temps d'exécution pour 500 périodes : {time.time() - t0:.5f} secondes"
 Exercice 2 : Arbre binomial avec Numpy en utilisant du code totalement vectorisé
 '''
 
-print("\n" + "="*70)
-print("Exercice 2 : CONSTRUCTION D'UN ARBRE BINOMIAL - CODE VECTORISÉ AVEC NUMPY")
-print("="*70)
-
-# Fonction de simulation d'arbre binomial à 4 périodes
-M = 4 
-# Séquence de 0 à M 
-up = np.arange(M + 1) 
-
-# Objet ndarray avec mouvements bruts à la hausse 
-up = np.resize(up, (M + 1, M +1))
-print("Mouvements bruts à la hausse :")
-print(up)
-
-# Objet ndarray avec mouvements bruts à la baisse
-down = up.T * 2
-print("\nMouvements bruts à la baisse :")
-print(down)
-
-# Objet ndarray avec mouvements nets à la hausse (positif) et à la baisse (négatif)
-net = up - down
-print("\nMouvements nets à la hausse et à la baisse :")
-print(net)
-
-# Calcul de la longueur de chaque intervalle temporel 
-dt = T / M 
-# Arbre pour quatre intervalles temporels (triangle de valeurs du coin supérieur droit)
-S0 * np.exp(sigma * math.sqrt(dt) * (up - down))
-
 # Code format compact pour générer un arbre binomial avec Numpy
 def simulate_tree_np(M):
     dt = T / M 
@@ -123,12 +102,42 @@ def simulate_tree_np(M):
     S = S0 * np.exp(sigma * math.sqrt(dt) * (up - down))
     return S
 
-print("\nArbre binomial avec Numpy vectorisé 4 périodes :")
-print(simulate_tree_np(4))
-print("\nArbre binomial avec Numpy vectorisé 500 périodes :")
-t0 = time.time()
-print(simulate_tree_np(500))
-print(f"Temps d'exécution pour 500 périodes : {time.time() - t0:.5f} secondes")
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 2 : CONSTRUCTION D'UN ARBRE BINOMIAL - CODE VECTORISÉ AVEC NUMPY")
+    print("="*70)
+
+    # Fonction de simulation d'arbre binomial à 4 périodes
+    M = 4 
+    # Séquence de 0 à M 
+    up = np.arange(M + 1) 
+
+    # Objet ndarray avec mouvements bruts à la hausse 
+    up = np.resize(up, (M + 1, M +1))
+    print("Mouvements bruts à la hausse :")
+    print(up)
+
+    # Objet ndarray avec mouvements bruts à la baisse
+    down = up.T * 2
+    print("\nMouvements bruts à la baisse :")
+    print(down)
+
+    # Objet ndarray avec mouvements nets à la hausse (positif) et à la baisse (négatif)
+    net = up - down
+    print("\nMouvements nets à la hausse et à la baisse :")
+    print(net)
+
+    # Calcul de la longueur de chaque intervalle temporel 
+    dt = T / M 
+    # Arbre pour quatre intervalles temporels (triangle de valeurs du coin supérieur droit)
+    S0 * np.exp(sigma * math.sqrt(dt) * (up - down))
+
+    print("\nArbre binomial avec Numpy vectorisé 4 périodes :")
+    print(simulate_tree_np(4))
+    print("\nArbre binomial avec Numpy vectorisé 500 périodes :")
+    t0 = time.time()
+    print(simulate_tree_np(500))
+    print(f"Temps d'exécution pour 500 périodes : {time.time() - t0:.5f} secondes")
 
 
 
@@ -136,20 +145,25 @@ print(f"Temps d'exécution pour 500 périodes : {time.time() - t0:.5f} secondes"
 '''
 Exercice 3 : Variante de l'arbre binomial avec Numba
 L'algorithme de simulation d'arbre binomial devrait être optimisable grâce à la compilation dynamique de Numba.
+La signature explicite déclenche la compilation dès cette ligne et le cache disque évite de la refaire aux lancements
+suivants : le temps d'exécution affiché ne contient plus la compilation, reportée à part (voir compilation_numba.py).
 '''
 
-print("\n" + "="*70)
-print("Exercice 3 : CONSTRUCTION D'UN ARBRE BINOMIAL - CODE OPTIMISÉ AVEC NUMBA")
-print("="*70)
 # Version optimisée de la fonction de simulation d'arbre binomial avec Numba
-simulate_tree_nb = numba.jit(simulate_tree)
+simulate_tree_nb = compile_kernel(simulate_tree, "float64[:, :](int64)")
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 3 : CONSTRUCTION D'UN ARBRE BINOMIAL - CODE OPTIMISÉ AVEC NUMBA")
+    print("="*70)
 
-print("\nArbre binomial avec Numba optimisé 4 périodes :")
-print(simulate_tree_nb(4))
-print("\nArbre binomial avec Numba optimisé 500 périodes :")
-t0 = time.time()
-print(simulate_tree_nb(500))
-print(f"Temps d'exécution pour 500 périodes : {time.time() - t0:.5f} secondes")
+    print("\nArbre binomial avec Numba optimisé 4 périodes :")
+    print(simulate_tree_nb(4))
+    print("\nArbre binomial avec Numba optimisé 500 périodes :")
+    t0 = time.time()
+    print(simulate_tree_nb(500))
+    print(f"Temps d'exécution pour 500 périodes : {time.time() - t0:.5f} secondes (hors compilation)")
+    compilation_report()
 
 
 
@@ -157,9 +171,11 @@ print(f"Temps d'exécution pour 500 périodes : {time.time() - t0:.5f} secondes"
 '''
 Exercice 4 : Variante de l'arbre binomial avec Cython (WIP - Necessite une image Docker)
 '''
-print("\n" + "="*70)
-print("Exercice 4 : CONSTRUCTION D'UN ARBRE BINOMIAL - CODE OPTIMISÉ AVEC CYTHON (WIP - Necessite une image Docker)")
-print("="*70)
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 4 : CONSTRUCTION D'UN ARBRE BINOMIAL - CODE OPTIMISÉ AVEC CYTHON (WIP - Necessite une image Docker)")
+    print("="*70)
 
 
 
@@ -171,10 +187,6 @@ print("="*70)
 Exercice 5 : Affichage graphique de l'arbre binomial avec Matplotlib
 '''
 
-print("\n" + "="*70)
-print("Exercice 5 : CONSTRUCTION D'UN ARBRE BINOMIAL - AFFICHAGE GRAPHIQUE AVEC MATPLOTLIB")
-print("="*70)
-
 S0 = 36.
 T = 1.0
 r = 0.06 
@@ -194,44 +206,83 @@ def simulate_tree(M):
         z += 1
     return S
 
-def plot_tree(S):
-    M = S.shape[1] - 1 
-    fig, ax = plt.subplots(figsize=(14, 8)) 
-    
-    # Tracer les noeuds et les connexions
-    for t in range(M + 1):
-        for i in range(t + 1):
-            x = t  # Position horizontale (temps)
-            y = i  # Position verticale (prix)
-            
-            # Afficher le noeud (prix)
-            ax.plot(x, y, 'o', markersize=8, color='blue')
-            ax.text(x, y - 0.3, f'{S[i, t]:.1f}', ha='center', fontsize=9)
-            
-            # Tracer les lignes vers les noeuds suivants
-            if t < M:
-                ax.plot([x, x + 1], [y, y], 'k-', alpha=0.3, linewidth=1)      # Hausse
-                ax.plot([x, x + 1], [y, y + 1], 'k-', alpha=0.3, linewidth=1)  # Baisse
-    
+# Affichage de l'arbre par collections : une LineCollection pour toutes les branches, un seul scatter pour tous les nœuds.
+# Un artiste Matplotlib par nœud et par branche (O(M²) artistes) rend l'affichage inutilisable au-delà de M ≈ 50.
+# Les étiquettes de prix sont éclaircies selon le niveau de détail : au plus max_labels étiquettes dans la zone visible,
+# recalculées à chaque zoom, une période et un nœud sur k étant étiquetés.
+def plot_tree(S, max_labels=300, filename=None, show=True):
+    M = S.shape[1] - 1
+    fig, ax = plt.subplots(figsize=(14, 8))
+
+    # Nœuds (t, i) avec i <= t : t est la position horizontale (temps), i la position verticale (nombre de baisses)
+    t_nodes, i_nodes = np.tril_indices(M + 1)
+    prices = S[i_nodes, t_nodes]
+
+    # Les branches alignées sont fusionnées en segments : les hausses d'un niveau i forment la droite (i, i) -> (M, i)
+    # et les baisses de même écart c = t - i la diagonale (c, 0) -> (M, M - c), soit 2M segments au lieu de M(M + 1)
+    levels = np.arange(M)
+    segments = np.concatenate((np.stack((np.column_stack((levels, levels)), np.column_stack((np.full(M, M), levels))), axis=1),
+                               np.stack((np.column_stack((levels, np.zeros(M))), np.column_stack((np.full(M, M), M - levels))), axis=1)))
+    large = M > 50                                   # Collections rastérisées pour garder les fichiers vectoriels légers
+    ax.add_collection(LineCollection(segments, colors='k', alpha=0.3, linewidths=1 if M <= 50 else 0.3, rasterized=large))
+    ax.scatter(t_nodes, i_nodes, s=64 * min(1, (20 / M) ** 2) if M else 64, color='blue', zorder=2, rasterized=large)
+
+    labels = []
+    fontsize = max(5, 9 * min(1, 20 / M)) if M else 9
+
+    def update_labels(ax):
+        for label in labels:
+            label.remove()
+        labels.clear()
+        (x0, x1), (y0, y1) = sorted(ax.get_xlim()), sorted(ax.get_ylim())
+        visible = (t_nodes >= x0) & (t_nodes <= x1) & (i_nodes >= y0) & (i_nodes <= y1)
+        k = max(1, math.ceil(math.sqrt(visible.sum() / max_labels)))
+        for idx in np.flatnonzero(visible & (t_nodes % k == 0) & (i_nodes % k == 0)):
+            labels.append(ax.text(t_nodes[idx], i_nodes[idx] - 0.3, f'{prices[idx]:.1f}', ha='center', fontsize=fontsize))
+
     ax.set_xlabel('Périodes (temps)', fontsize=12)
     ax.set_ylabel('Prix de l\'action', fontsize=12)
     ax.set_title('Arbre Binomial - Évolution du Prix de l\'Action', fontsize=14, fontweight='bold')
     ax.grid(True, alpha=0.3)
     ax.set_xlim(-0.5, M + 0.5)
     ax.set_ylim(-1, M + 1)
+    # Étiquettes ajoutées après la mise en page, qui déclenche un rendu complet de la figure
     plt.tight_layout()
-    plt.show()
-
-# Set_printoptions pour un affichage plus lisible des prix dans l'arbre
-np.set_printoptions(formatter={'float': lambda x: '%6.2f' % x})
-# Créer l'arbre binomial
-M = 20               # Nombre de périodes (intervalles temporels)
-S = simulate_tree(M) # Générer l'arbre binomial avec M périodes
-print(f"Arbre binomial créé avec {M} périodes")
-print(f"Prix initial : {S[0,0]:.2f}€")
-print(f"Prix final min : {np.min(S[S > 0]):.5f}€")
-print(f"Prix final max : {np.max(S):.5f}€")
-plot_tree(S)
+    update_labels(ax)
+    ax.callbacks.connect('xlim_changed', update_labels)
+    ax.callbacks.connect('ylim_changed', update_labels)
+    if filename:
+        fig.savefig(filename)
+    if show:
+        plt.show()
+    return fig
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 5 : CONSTRUCTION D'UN ARBRE BINOMIAL - AFFICHAGE GRAPHIQUE AVEC MATPLOTLIB")
+    print("="*70)
+
+    # Set_printoptions pour un affichage plus lisible des prix dans l'arbre
+    np.set_printoptions(formatter={'float': lambda x: '%6.2f' % x})
+    # Créer l'arbre binomial
+    M = 20               # Nombre de périodes (intervalles temporels)
+    S = simulate_tree(M) # Générer l'arbre binomial avec M périodes
+    print(f"Arbre binomial créé avec {M} périodes")
+    print(f"Prix initial : {S[0,0]:.2f}€")
+    print(f"Prix final min : {np.min(S[S > 0]):.5f}€")
+    print(f"Prix final max : {np.max(S):.5f}€")
+    plot_tree(S)
+
+    # Arbre de 500 périodes : 125 751 nœuds et 250 500 branches, rendu et enregistrement en PNG
+    import io
+    S = simulate_tree(500)
+    t0 = time.time()
+    fig = plot_tree(S, show=False)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    print(f"Arbre de 500 périodes rendu en {time.time() - t0:.3f} secondes, {len(fig.axes[0].texts)} étiquettes, "
+          f"fichier PNG de {buffer.tell() / 1e3:.0f} Ko")
+    plt.close(fig)
 
 
 
@@ -244,10 +295,6 @@ puis on vérifie la cohérence du modèle par benchmark avec la formule fermée
 - Comparaison avec la formule fermée de Black-Scholes-Merton
 '''
 
-print("\n" + "="*70)
-print("Exercice 6 : VALORISATION D'OPTIONS EUROPÉENNES PAR ARBRE BINOMIAL")
-print("="*70)
-
 # Paramètres 
 S0 = 36.              # Prix spot du sous-jacent
 K = 40.               # Strike (prix d'exercice)
@@ -256,18 +303,99 @@ r = 0.06              # Taux sans risque continu
 sigma = 0.2           # Volatilité annualisée
 M = 500               # Nombre de pas temporels
 
+# Pas de l'arbre entre deux dates d'exercice : 0 pour une option européenne, 1 pour une américaine
+def exercise_every(exercise="EUROPEAN", exercise_step=1):
+    '''
+    Traduit le style d'exercice ("EUROPEAN", "AMERICAN" ou "BERMUDAN") en pas d'exercice dans l'arbre.
+    Pour une option bermudéenne, l'exercice anticipé est autorisé tous les exercise_step pas.
+    '''
+    if exercise == "EUROPEAN":
+        return 0
+    if exercise == "AMERICAN":
+        return 1
+    return exercise_step
+
+# Backward induction en place sur un seul vecteur de valeurs (mémoire O(M))
+def lattice_backward_induction(V, ST, K, u, q, discount, option_type="CALL", step=0, return_levels=False):
+    '''
+    Réduit niveau par niveau le vecteur V des valeurs de l'option au dernier niveau L = len(V) - 1 de l'arbre,
+    où ST contient les prix du sous-jacent correspondants, et retourne la valeur à la racine.
+    Au niveau t, V[:t] = discount * (q * V[:t] + (1 - q) * V[1:t+1]) ; les prix du niveau t - 1 s'obtiennent
+    par S[i, t - 1] = S[i, L] * u^(t - 1 - L), ce qui vaut pour tout arbre recombinant (u, d).
+    step est le pas entre deux dates d'exercice anticipé (0 = européenne).
+    Avec return_levels=True, retourne aussi les valeurs des niveaux 1 et 2 (pour les grecques).
+    '''
+    L = len(V) - 1
+    if return_levels and L < 3:
+        raise ValueError(f"les grecques de l'arbre demandent au moins 3 pas (niveaux 1 et 2 avant la maturité), reçu {L}")
+    levels = {}
+    qu, qd = discount * q, discount * (1 - q)
+    tmp = np.empty(L)
+    for t in range(L, 0, -1):
+        np.multiply(V[1:t + 1], qd, out=tmp[:t])
+        V[:t] *= qu
+        V[:t] += tmp[:t]
+        # Exercice anticipé au niveau t - 1
+        if step and (t - 1) % step == 0:
+            S_t = ST[:t] * u ** (t - 1 - L)
+            np.maximum(V[:t], S_t - K if option_type == "CALL" else K - S_t, out=V[:t])
+        if return_levels and t - 1 in (1, 2):
+            levels[t - 1] = V[:t].copy()
+    if return_levels:
+        return V[0], levels[1], levels[2]
+    return V[0]
+
+# Grecques lues sur les nœuds proches de la racine de l'arbre CRR
+def lattice_greeks(S0, u, d, dt, V0, V1, V2):
+    '''
+    Delta, gamma et theta à partir des valeurs de l'option aux niveaux 0, 1 (S0u, S0d) et 2 (S0u², S0, S0d²).
+    Le nœud central du niveau 2 a le même prix S0 que la racine, deux pas plus tard : theta = (V2[1] - V0) / (2 dt).
+    '''
+    delta = (V1[0] - V1[1]) / (S0 * u - S0 * d)
+    delta_up = (V2[0] - V2[1]) / (S0 * u * u - S0)
+    delta_down = (V2[1] - V2[2]) / (S0 - S0 * d * d)
+    gamma = (delta_up - delta_down) / (0.5 * (S0 * u * u - S0 * d * d))
+    theta = (V2[1] - V0) / (2 * dt)
+    return {"delta": delta, "gamma": gamma, "theta": theta}
+
 # Construction de l'arbre et valorisation par backward induction sous la probabilité risque-neutre q
-def binomial_option_price(S0, K, T, r, sigma, M, option_type="CALL"):
+def binomial_option_price(S0, K, T, r, sigma, M, option_type="CALL", return_trees=False,
+                          exercise="EUROPEAN", exercise_step=1, greeks=False, bump_sigma=0.01, bump_r=0.001):
     '''
     Valorisation d'une option européenne par le modèle binomial de CRR.
     Backward induction sous la probabilité risque-neutre q.
-    Retourne le prix de l'option, l'arbre des prix du sous-jacent et l'arbre des valeurs de l'option.
+    Avec exercise="AMERICAN" (ou "BERMUDAN" tous les exercise_step pas), la valeur de continuation
+    est comparée à chaque date d'exercice à la valeur intrinsèque (exercice anticipé).
+    Par défaut, seul le vecteur des payoffs à maturité est conservé (mémoire O(M)) et il est
+    réduit niveau par niveau par découpage NumPy ; la fonction retourne alors le prix seul.
+    Avec return_trees=True, les arbres complets (M+1)x(M+1) sont construits et la fonction retourne
+    le prix de l'option, l'arbre des prix du sous-jacent et l'arbre des valeurs de l'option.
+    Avec greeks=True, un dictionnaire de grecques est ajouté au résultat : delta, gamma et theta sont lus sur les
+    nœuds proches de la racine de la même backward induction ; vega et rho sont obtenus par différences centrées
+    (bump_sigma, bump_r) en valorisant les quatre scénarios ensemble sur un seul treillis 2D ; elles demandent M >= 3.
     '''
+    if greeks and M < 3:
+        raise ValueError(f"greeks=True demande au moins M = 3 pas (nœuds des niveaux 1 et 2), reçu M = {M}")
     dt = T / M                              # Longueur de chaque intervalle temporel
     u = math.exp(sigma * math.sqrt(dt))     # Facteur de mouvement à la hausse
     d = 1 / u                               # Facteur de mouvement à la baisse
     q = (math.exp(r * dt) - d) / (u - d)    # Probabilité risque-neutre de hausse
     discount = math.exp(-r * dt)            # Facteur d'actualisation par pas
+    step = exercise_every(exercise, exercise_step)
+
+    if not return_trees:
+        # Prix du sous-jacent à maturité : S0 * u^(M - i) * d^i = S0 * u^(M - 2i), nœud i = 0 en haut
+        ST = S0 * np.exp(sigma * math.sqrt(dt) * np.arange(M, -M - 1, -2))
+        # Payoff à maturité, seul vecteur conservé (M + 1 valeurs)
+        if option_type == "CALL":
+            V = np.maximum(ST - K, 0)
+        else:
+            V = np.maximum(K - ST, 0)
+        if not greeks:
+            return lattice_backward_induction(V, ST, K, u, q, discount, option_type, step)
+        V0, V1, V2 = lattice_backward_induction(V, ST, K, u, q, discount, option_type, step, return_levels=True)
+        return V0, lattice_greeks(S0, u, d, dt, V0, V1, V2) | bumped_greeks(S0, K, T, r, sigma, M, option_type, exercise,
+                                                                            exercise_step, bump_sigma, bump_r)
 
     # Construction de l'arbre des prix du sous-jacent
     S = np.zeros((M + 1, M + 1))
@@ -288,19 +416,28 @@ def binomial_option_price(S0, K, T, r, sigma, M, option_type="CALL"):
     for t in range(M - 1, -1, -1):
         for i in range(t + 1):
             C[i, t] = discount * (q * C[i, t + 1] + (1 - q) * C[i + 1, t + 1])
+            # Exercice anticipé : la valeur de l'option est au moins sa valeur intrinsèque
+            if step and t % step == 0:
+                C[i, t] = max(C[i, t], S[i, t] - K if option_type == "CALL" else K - S[i, t])
 
+    if greeks:
+        return C[0, 0], S, C, lattice_greeks(S0, u, d, dt, C[0, 0], C[:2, 1], C[:3, 2]) | bumped_greeks(
+            S0, K, T, r, sigma, M, option_type, exercise, exercise_step, bump_sigma, bump_r)
     return C[0, 0], S, C
 
-# Calcul du Call et du Put
-call_price, S_tree, C_tree = binomial_option_price(S0, K, T, r, sigma, M, "CALL")
-put_price, _, P_tree = binomial_option_price(S0, K, T, r, sigma, M, "PUT")
-
-print(f"\nParamètres : S0={S0}, K={K}, T={T}, r={r}, σ={sigma}, M={M}")
-print(f"Prix du CALL européen (binomial) : {call_price:.4f}€")
-print(f"Prix du PUT européen (binomial)  : {put_price:.4f}€")
+# Vega et rho par différences centrées, les scénarios choqués partageant un même treillis 2D
+def bumped_greeks(S0, K, T, r, sigma, M, option_type="CALL", exercise="EUROPEAN", exercise_step=1,
+                  bump_sigma=0.01, bump_r=0.001):
+    '''
+    Valorise en un seul appel de binomial_option_price_batch les scénarios σ ± bump_sigma et r ± bump_r,
+    puis retourne vega et rho par différences centrées.
+    '''
+    sigmas = np.array([sigma + bump_sigma, sigma - bump_sigma, sigma, sigma])
+    rates = np.array([r, r, r + bump_r, r - bump_r])
+    prices = binomial_option_price_batch(S0, K, T, rates, sigmas, M, option_type, exercise, exercise_step)
+    return {"vega": (prices[0] - prices[1]) / (2 * bump_sigma), "rho": (prices[2] - prices[3]) / (2 * bump_r)}
 
 # Formule fermée de Black-Scholes-Merton (benchmark analytique)
-
 def black_scholes(S0, K, T, r, sigma, option_type="CALL"):
     '''
     Formule fermée de Black-Scholes-Merton pour une option européenne.
@@ -316,13 +453,510 @@ def black_scholes(S0, K, T, r, sigma, option_type="CALL"):
         price = K * math.exp(-r * T) * norm.cdf(-d2) - S0 * norm.cdf(-d1)
     return price, d1, d2
 
-call_bs, d1, d2 = black_scholes(S0, K, T, r, sigma, "CALL")
-put_bs, _, _ = black_scholes(S0, K, T, r, sigma, "PUT")
+# Formule de Black-Scholes-Merton vectorisée, prix et grecques en une seule passe sur des tableaux
+def black_scholes_np(S0, K, T, r, sigma, option_type="CALL", greeks=True):
+    '''
+    Version tableau de black_scholes : S0, K, T, r, sigma et option_type ("CALL"/"PUT") sont des scalaires
+    ou des tableaux NumPy diffusables entre eux.
+    Retourne un dictionnaire de tableaux : price, et avec greeks=True delta, gamma, vega, theta et rho.
+    Avec s = +1 pour un Call et -1 pour un Put, les deux types partagent les mêmes termes :
+    prix = s * (S0 * N(s * d1) - K * e^{-rT} * N(s * d2)), delta = s * N(s * d1), rho = s * K * T * e^{-rT} * N(s * d2).
+    La fonction de répartition normale est scipy.special.ndtr, bien plus rapide que norm.cdf.
+    '''
+    s = np.where(np.asarray(option_type) == "CALL", 1.0, -1.0)
+    # Toutes les sorties ont la forme commune des entrées, y compris gamma et vega qui ne dépendent pas du type
+    S0, K, T, r, sigma, s = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S0, K, T, r, sigma, s)))
+    sqrt_T = np.sqrt(T)
+    vol_sqrt_T = sigma * sqrt_T
+    d1 = (np.log(S0 / K) + (r + 0.5 * sigma ** 2) * T) / vol_sqrt_T
+    d2 = d1 - vol_sqrt_T
+    K_disc = K * np.exp(-r * T)                     # Strike actualisé
+    N1 = ndtr(s * d1)
+    N2 = ndtr(s * d2)
+    result = {"price": s * (S0 * N1 - K_disc * N2)}
+    if greeks:
+        n1 = np.exp(-0.5 * d1 ** 2) / math.sqrt(2 * math.pi)  # Densité normale en d1
+        S_n1 = S0 * n1
+        result["delta"] = s * N1
+        result["gamma"] = n1 / (S0 * vol_sqrt_T)
+        result["vega"] = S_n1 * sqrt_T
+        result["theta"] = -S_n1 * sigma / (2 * sqrt_T) - s * r * K_disc * N2
+        result["rho"] = s * T * K_disc * N2
+    return result
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 6 : VALORISATION D'OPTIONS EUROPÉENNES PAR ARBRE BINOMIAL")
+    print("="*70)
+
+    # Calcul du Call et du Put
+    call_price, S_tree, C_tree = binomial_option_price(S0, K, T, r, sigma, M, "CALL", return_trees=True)
+    put_price, _, P_tree = binomial_option_price(S0, K, T, r, sigma, M, "PUT", return_trees=True)
+
+    print(f"\nParamètres : S0={S0}, K={K}, T={T}, r={r}, σ={sigma}, M={M}")
+    print(f"Prix du CALL européen (binomial) : {call_price:.4f}€")
+    print(f"Prix du PUT européen (binomial)  : {put_price:.4f}€")
+
+    call_bs, d1, d2 = black_scholes(S0, K, T, r, sigma, "CALL")
+    put_bs, _, _ = black_scholes(S0, K, T, r, sigma, "PUT")
+
+    print(f"\nPrix du CALL européen (Black-Scholes) : {call_bs:.4f}€")
+    print(f"Prix du PUT européen (Black-Scholes)  : {put_bs:.4f}€")
+    print(f"Écart CALL (binomial vs BS) : {abs(call_price - call_bs):.6f}€")
+    print(f"Écart PUT  (binomial vs BS) : {abs(put_price - put_bs):.6f}€")
+
+
+
+
+'''
+Exercice 7 : Valorisation économe en mémoire par backward induction vectorisée
+Les arbres complets S et C occupent deux tableaux (M+1)x(M+1) : pour M = 5000, cela représente environ 400 Mo.
+Or la backward induction n'a besoin que du niveau suivant de l'arbre : on ne conserve qu'un seul vecteur de payoffs
+à maturité, que l'on réduit niveau par niveau par découpage NumPy (mémoire O(M)).
+Les arbres complets ne sont construits que sur demande (return_trees=True).
+'''
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 7 : VALORISATION ÉCONOME EN MÉMOIRE (O(M)) PAR BACKWARD INDUCTION VECTORISÉE")
+    print("="*70)
+
+    # Cohérence avec la valorisation par arbres complets de l'exercice 6
+    call_vect = binomial_option_price(S0, K, T, r, sigma, M, "CALL")
+    put_vect = binomial_option_price(S0, K, T, r, sigma, M, "PUT")
+    print(f"\nPrix du CALL européen (vecteur terminal, M={M}) : {call_vect:.4f}€ (écart avec les arbres : {abs(call_vect - call_price):.2e})")
+    print(f"Prix du PUT européen (vecteur terminal, M={M})  : {put_vect:.4f}€ (écart avec les arbres : {abs(put_vect - put_price):.2e})")
+
+    # Comparaison des temps d'exécution et de l'empreinte mémoire
+    t0 = time.time()
+    binomial_option_price(S0, K, T, r, sigma, M, "PUT", return_trees=True)
+    print(f"\nTemps d'exécution avec arbres complets (M={M})     : {time.time() - t0:.5f} secondes, mémoire ≈ {2 * (M + 1) ** 2 * 8 / 1e6:.1f} Mo")
+    for M_grand in [M, 5_000, 10_000]:
+        t0 = time.time()
+        put_grand = binomial_option_price(S0, K, T, r, sigma, M_grand, "PUT")
+        print(f"Temps d'exécution avec vecteur terminal (M={M_grand:>6}) : {time.time() - t0:.5f} secondes, mémoire ≈ {2 * (M_grand + 1) * 8 / 1e3:.1f} Ko, PUT = {put_grand:.4f}€")
+
+
+
+
+'''
+Exercice 8 : Valorisation groupée d'une chaîne d'options en un seul appel
+Plutôt que d'appeler binomial_option_price option par option dans une boucle Python, on valorise toute une chaîne
+(tableaux de strikes, maturités et volatilités) sur un treillis 2D (option x nœud).
+Les facteurs de hausse/baisse à maturité ne dépendent que de T et σ : ils sont calculés une seule fois par couple (T, σ)
+puis partagés entre toutes les options concernées. La backward induction réduit ensuite toutes les lignes en même temps.
+'''
+
+def binomial_option_price_batch(S0, K, T, r, sigma, M, option_type="CALL", exercise="EUROPEAN", exercise_step=1):
+    '''
+    Valorisation groupée d'options européennes par le modèle binomial de CRR.
+    S0, K, T, r, sigma et option_type ("CALL"/"PUT") sont des scalaires ou des tableaux diffusables (broadcasting)
+    entre eux ; M est le nombre de pas commun à toutes les options.
+    exercise et exercise_step ont le même sens que pour binomial_option_price et sont communs à toute la chaîne.
+    Retourne le tableau des prix, de la forme commune des paramètres.
+    '''
+    S0, K, T, r, sigma, option_type = np.broadcast_arrays(S0, K, T, r, sigma, option_type)
+    shape = S0.shape
+    S0, K, T, r, sigma = (np.asarray(x, dtype=float).ravel() for x in (S0, K, T, r, sigma))
+    is_call = (option_type == "CALL").ravel()
+
+    dt = T / M                                  # Longueur des intervalles, par option
+    u = np.exp(sigma * np.sqrt(dt))             # Facteurs de hausse, par option
+    d = 1 / u                                   # Facteurs de baisse, par option
+    q = (np.exp(r * dt) - d) / (u - d)          # Probabilités risque-neutres, par option
+    discount = np.exp(-r * dt)                  # Facteurs d'actualisation par pas, par option
+    step = exercise_every(exercise, exercise_step)
+
+    # Facteurs u^(M - 2i) à maturité calculés une seule fois par couple (T, σ) distinct
+    pairs, inverse = np.unique(np.column_stack((T, sigma)), axis=0, return_inverse=True)
+    factors = np.exp(np.arange(M, -M - 1, -2)[:, None] * pairs[:, 1] * np.sqrt(pairs[:, 0] / M))
+
+    # Treillis 2D des payoffs à maturité, stocké nœud x option pour que les tranches V[:t] soient contiguës
+    ST = np.ascontiguousarray(factors[:, inverse.ravel()]) * S0
+    V = np.where(is_call, np.maximum(ST - K, 0), np.maximum(K - ST, 0))
+
+    # Backward induction simultanée sur toutes les options
+    qu, qd = discount * q, discount * (1 - q)
+    tmp = np.empty((M, len(S0)))
+    for t in range(M, 0, -1):
+        np.multiply(V[1:t + 1], qd, out=tmp[:t])
+        V[:t] *= qu
+        V[:t] += tmp[:t]
+        if step and (t - 1) % step == 0:
+            S_t = ST[:t] * d ** (M - t + 1)
+            np.maximum(V[:t], np.where(is_call, S_t - K, K - S_t), out=V[:t])
+    return V[0].reshape(shape)
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 8 : VALORISATION GROUPÉE D'UNE CHAÎNE D'OPTIONS (TREILLIS 2D OPTION x NŒUD)")
+    print("="*70)
+
+    # Chaîne CALL et PUT en un seul appel (la colonne option_type est diffusée sur les strikes)
+    strikes = np.arange(30., 52., 2.)
+    chain = binomial_option_price_batch(S0, strikes[:, None], T, r, sigma, M, np.array(["CALL", "PUT"]))
+    print(f"\nChaîne d'options (S0={S0}, T={T}, r={r}, σ={sigma}, M={M}) :")
+    print(f"{'Strike':>8} {'CALL':>10} {'PUT':>10}")
+    for k, (c, p) in zip(strikes, chain):
+        print(f"{k:>8.1f} {c:>10.4f} {p:>10.4f}")
+    print(f"Écart avec binomial_option_price pour K={K} : {abs(chain[strikes == K, 0][0] - call_price):.2e}€ (CALL), "
+          f"{abs(chain[strikes == K, 1][0] - put_price):.2e}€ (PUT)")
+
+    # Portefeuille de 4 000 options : boucle Python vs appel groupé
+    np.random.seed(1000)
+    n_options = 4_000
+    K_book = np.random.uniform(30., 45., n_options)
+    T_book = np.random.choice([0.25, 0.5, 1.0, 2.0], n_options)
+    sigma_book = np.random.choice([0.15, 0.2, 0.25, 0.3], n_options)
+    type_book = np.random.choice(["CALL", "PUT"], n_options)
+    M_book = 200
+
+    t0 = time.time()
+    prices_loop = np.array([binomial_option_price(S0, k, t, r, s, M_book, o)
+                            for k, t, s, o in zip(K_book, T_book, sigma_book, type_book)])
+    t_loop = time.time() - t0
+    t0 = time.time()
+    prices_batch = binomial_option_price_batch(S0, K_book, T_book, r, sigma_book, M_book, type_book)
+    t_batch = time.time() - t0
+    print(f"\nPortefeuille de {n_options} options, M={M_book} :")
+    print(f"Temps d'exécution boucle Python   : {t_loop:.5f} secondes")
+    print(f"Temps d'exécution appel groupé    : {t_batch:.5f} secondes (accélération x{t_loop / t_batch:.1f})")
+    print(f"Écart maximal entre les deux méthodes : {np.max(np.abs(prices_loop - prices_batch)):.2e}€")
+
+
+
+
+'''
+Exercice 9 : Exercice anticipé (options américaines et bermudéennes) et moteur de treillis Numba parallèle
+Une option américaine peut être exercée à tout instant : lors de la backward induction, la valeur de chaque nœud est
+le maximum entre la valeur de continuation et la valeur intrinsèque. Une option bermudéenne ne peut être exercée
+qu'à certaines dates (ici tous les exercise_step pas de l'arbre).
+Le moteur Numba compile la backward induction complète et répartit les options entre les cœurs (parallel=True, prange).
+'''
+
+def crr_lattice(S0, K, T, r, sigma, is_call, M, step):
+    '''
+    Backward induction CRR pour un tableau d'options, une option par itération de prange (compilée par Numba).
+    step est le pas entre deux dates d'exercice (0 = européenne, 1 = américaine).
+    '''
+    n = S0.shape[0]
+    prices = np.empty(n)
+    for k in numba.prange(n):
+        dt = T[k] / M
+        u = math.exp(sigma[k] * math.sqrt(dt))
+        d = 1 / u
+        q = (math.exp(r[k] * dt) - d) / (u - d)
+        discount = math.exp(-r[k] * dt)
+        qu, qd = discount * q, discount * (1 - q)
+        sign = 1.0 if is_call[k] else -1.0
+        # Prix et payoffs à maturité
+        S = np.empty(M + 1)
+        V = np.empty(M + 1)
+        S[0] = S0[k] * u ** M
+        for i in range(1, M + 1):
+            S[i] = S[i - 1] * d * d
+        for i in range(M + 1):
+            V[i] = max(sign * (S[i] - K[k]), 0.0)
+        # Backward induction avec exercice anticipé aux dates autorisées
+        for t in range(M - 1, -1, -1):
+            exercise_date = step > 0 and t % step == 0
+            for i in range(t + 1):
+                S[i] *= d
+                V[i] = qu * V[i] + qd * V[i + 1]
+                if exercise_date:
+                    V[i] = max(V[i], sign * (S[i] - K[k]))
+        prices[k] = V[0]
+    return prices
+
+crr_lattice_nb = compile_kernel(crr_lattice, "float64[:](float64[:], float64[:], float64[:], float64[:], float64[:], "
+                                             "boolean[:], int64, int64)", parallel=True)
+
+def binomial_option_price_nb(S0, K, T, r, sigma, M, option_type="CALL", exercise="EUROPEAN", exercise_step=1):
+    '''
+    Valorisation groupée par le moteur Numba parallèle, même interface que binomial_option_price_batch.
+    '''
+    S0, K, T, r, sigma, option_type = np.broadcast_arrays(S0, K, T, r, sigma, option_type)
+    shape = S0.shape
+    S0, K, T, r, sigma = (np.ascontiguousarray(x, dtype=float).ravel() for x in (S0, K, T, r, sigma))
+    is_call = np.ascontiguousarray(option_type == "CALL").ravel()
+    return crr_lattice_nb(S0, K, T, r, sigma, is_call, M, exercise_every(exercise, exercise_step)).reshape(shape)
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 9 : EXERCICE ANTICIPÉ ET MOTEUR DE TREILLIS NUMBA PARALLÈLE")
+    print("="*70)
+
+    # Put européen, bermudéen (exercice tous les 50 pas, soit 10 dates) et américain
+    put_bermudan = binomial_option_price(S0, K, T, r, sigma, M, "PUT", exercise="BERMUDAN", exercise_step=50)
+    put_american = binomial_option_price(S0, K, T, r, sigma, M, "PUT", exercise="AMERICAN")
+    print(f"\nParamètres : S0={S0}, K={K}, T={T}, r={r}, σ={sigma}, M={M}")
+    print(f"Prix du PUT européen   : {put_price:.4f}€")
+    print(f"Prix du PUT bermudéen  : {put_bermudan:.4f}€ (exercice tous les 50 pas)")
+    print(f"Prix du PUT américain  : {put_american:.4f}€ (prime d'exercice anticipé : {put_american - put_price:.4f}€)")
+    print(f"Prix du PUT américain (arbres complets) : {binomial_option_price(S0, K, T, r, sigma, M, 'PUT', return_trees=True, exercise='AMERICAN')[0]:.4f}€")
+    print(f"Prix du PUT américain (Numba)           : {binomial_option_price_nb(S0, K, T, r, sigma, M, 'PUT', exercise='AMERICAN'):.4f}€")
+
+    # Benchmark sur un portefeuille de puts américains : Python pur, NumPy (option par option et groupé), Numba parallèle
+    n_bench = 100
+    M_bench = 200
+    K_bench, T_bench, sigma_bench = K_book[:n_bench], T_book[:n_bench], sigma_book[:n_bench]
+
+    timings = {}
+    t0 = time.time()
+    prices_py = [binomial_option_price(S0, k, t, r, s, M_bench, "PUT", return_trees=True, exercise="AMERICAN")[0]
+                 for k, t, s in zip(K_bench, T_bench, sigma_bench)]
+    timings["Python pur (arbres complets)"] = time.time() - t0
+    t0 = time.time()
+    prices_np = [binomial_option_price(S0, k, t, r, s, M_bench, "PUT", exercise="AMERICAN")
+                 for k, t, s in zip(K_bench, T_bench, sigma_bench)]
+    timings["NumPy vecteur terminal (boucle)"] = time.time() - t0
+    t0 = time.time()
+    prices_batch = binomial_option_price_batch(S0, K_bench, T_bench, r, sigma_bench, M_bench, "PUT", "AMERICAN")
+    timings["NumPy treillis 2D groupé"] = time.time() - t0
+    t0 = time.time()
+    prices_nb = binomial_option_price_nb(S0, K_bench, T_bench, r, sigma_bench, M_bench, "PUT", "AMERICAN")
+    timings["Numba parallèle"] = time.time() - t0
+
+    print(f"\nBenchmark : {n_bench} puts américains, M={M_bench}, {numba.get_num_threads()} thread(s) Numba")
+    for name, duration in timings.items():
+        print(f"{name:<35} : {duration:.5f} secondes (x{timings['Python pur (arbres complets)'] / duration:.1f})")
+    print(f"Écart maximal NumPy / Python : {np.max(np.abs(prices_np - np.array(prices_py))):.2e}€, "
+          f"groupé / Python : {np.max(np.abs(prices_batch - np.array(prices_py))):.2e}€, "
+          f"Numba / Python : {np.max(np.abs(prices_nb - np.array(prices_py))):.2e}€")
+
+    # Portefeuille complet de 4 000 puts américains avec le moteur Numba
+    t0 = time.time()
+    binomial_option_price_nb(S0, K_book, T_book, r, sigma_book, M_book, "PUT", "AMERICAN")
+    print(f"\nPortefeuille de {n_options} puts américains, M={M_book} (Numba parallèle) : {time.time() - t0:.5f} secondes")
+
 
-print(f"\nPrix du CALL européen (Black-Scholes) : {call_bs:.4f}€")
-print(f"Prix du PUT européen (Black-Scholes)  : {put_bs:.4f}€")
-print(f"Écart CALL (binomial vs BS) : {abs(call_price - call_bs):.6f}€")
-print(f"Écart PUT  (binomial vs BS) : {abs(put_price - put_bs):.6f}€")
 
 
+'''
+Exercice 10 : Arbres à convergence accélérée (Leisen-Reimer et extrapolation de Richardson)
+L'exercice 6 montre qu'il faut environ M = 500 pas à l'arbre CRR pour approcher Black-Scholes à quelques dixièmes de centime :
+l'erreur décroît en O(1/M) et oscille selon la position du strike entre les nœuds terminaux.
+- Leisen-Reimer (1996) : u, d et q sont choisis par inversion de Peizer-Pratt de N(d1) et N(d2), sur un nombre de pas impair.
+  L'arbre est alors centré sur le strike et l'erreur décroît en O(1/M²), sans oscillation.
+- Extrapolation de Richardson à deux points : si P(M) ≈ P + c/M, alors 2 * P(2M) - P(M) ≈ P.
+  Appliquée au CRR brut, l'oscillation de l'erreur la rend erratique ; on lisse donc le dernier pas de l'arbre par la formule
+  de Black-Scholes sur un intervalle dt (arbre "BBS" de Broadie et Detemple) avant d'extrapoler.
+'''
+
+def binomial_option_price_lr(S0, K, T, r, sigma, M, option_type="CALL", exercise="EUROPEAN", exercise_step=1):
+    '''
+    Valorisation par l'arbre de Leisen-Reimer (inversion de Peizer-Pratt, méthode 2).
+    M est arrondi au nombre impair supérieur. Retourne le prix de l'option.
+    '''
+    if M % 2 == 0:
+        M += 1
+    dt = T / M
+    d1 = (math.log(S0 / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+
+    # Inversion de Peizer-Pratt : probabilité binomiale approchant N(z)
+    def peizer_pratt(z):
+        return 0.5 + math.copysign(1, z) * math.sqrt(0.25 - 0.25 * math.exp(-(z / (M + 1 / 3 + 0.1 / (M + 1))) ** 2 * (M + 1 / 6)))
+
+    q = peizer_pratt(d2)                        # Probabilité risque-neutre de hausse
+    u = math.exp(r * dt) * peizer_pratt(d1) / q # Facteur de mouvement à la hausse
+    d = (math.exp(r * dt) - q * u) / (1 - q)    # Facteur de mouvement à la baisse
+    discount = math.exp(-r * dt)
+
+    i = np.arange(M + 1)
+    ST = S0 * u ** (M - i) * d ** i
+    V = np.maximum(ST - K, 0) if option_type == "CALL" else np.maximum(K - ST, 0)
+    return lattice_backward_induction(V, ST, K, u, q, discount, option_type, exercise_every(exercise, exercise_step))
+
+def binomial_option_price_bbs(S0, K, T, r, sigma, M, option_type="CALL", exercise="EUROPEAN", exercise_step=1):
+    '''
+    Arbre CRR dont le dernier pas est remplacé par la formule de Black-Scholes sur un intervalle dt (Broadie et Detemple).
+    Les valeurs de l'option au niveau M - 1 sont lisses en S, ce qui supprime l'oscillation de l'erreur du CRR.
+    '''
+    dt = T / M
+    u = math.exp(sigma * math.sqrt(dt))
+    d = 1 / u
+    q = (math.exp(r * dt) - d) / (u - d)
+    discount = math.exp(-r * dt)
+    step = exercise_every(exercise, exercise_step)
+
+    # Valeurs Black-Scholes au niveau M - 1
+    S = S0 * np.exp(sigma * math.sqrt(dt) * np.arange(M - 1, -M, -2))
+    V = black_scholes_np(S, K, dt, r, sigma, option_type, greeks=False)["price"]
+    if step and (M - 1) % step == 0:
+        V = np.maximum(V, S - K if option_type == "CALL" else K - S)
+    return lattice_backward_induction(V, S, K, u, q, discount, option_type, step)
+
+def binomial_option_price_richardson(S0, K, T, r, sigma, M, option_type="CALL", exercise="EUROPEAN", exercise_step=1,
+                                     smoothing=True):
+    '''
+    Extrapolation de Richardson à deux points de l'arbre CRR : 2 * P(2M) - P(M).
+    Avec smoothing=True (par défaut), P est l'arbre CRR lissé au dernier pas (binomial_option_price_bbs),
+    sinon l'arbre CRR brut. Les dates d'exercice bermudéennes sont conservées sur l'arbre à 2M pas.
+    '''
+    pricer = binomial_option_price_bbs if smoothing else binomial_option_price
+    coarse = pricer(S0, K, T, r, sigma, M, option_type, exercise=exercise, exercise_step=exercise_step)
+    fine = pricer(S0, K, T, r, sigma, 2 * M, option_type, exercise=exercise, exercise_step=2 * exercise_step)
+    return 2 * fine - coarse
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 10 : ARBRES À CONVERGENCE ACCÉLÉRÉE (LEISEN-REIMER ET RICHARDSON)")
+    print("="*70)
+
+    print(f"\nParamètres : S0={S0}, K={K}, T={T}, r={r}, σ={sigma}")
+    print(f"PUT européen Black-Scholes              : {put_bs:.6f}€")
+    print(f"PUT européen CRR (M=500)                : {put_price:.6f}€ (écart {abs(put_price - put_bs):.2e})")
+    print(f"PUT européen Leisen-Reimer (M=25)       : {binomial_option_price_lr(S0, K, T, r, sigma, 25, 'PUT'):.6f}€ "
+          f"(écart {abs(binomial_option_price_lr(S0, K, T, r, sigma, 25, 'PUT') - put_bs):.2e})")
+    print(f"PUT européen Richardson BBS (M=25/50)   : {binomial_option_price_richardson(S0, K, T, r, sigma, 25, 'PUT'):.6f}€ "
+          f"(écart {abs(binomial_option_price_richardson(S0, K, T, r, sigma, 25, 'PUT') - put_bs):.2e})")
+    print(f"PUT américain CRR (M=500)               : {put_american:.6f}€")
+    print(f"PUT américain Leisen-Reimer (M=51)      : {binomial_option_price_lr(S0, K, T, r, sigma, 51, 'PUT', 'AMERICAN'):.6f}€")
+    print(f"PUT américain Richardson BBS (M=50/100) : {binomial_option_price_richardson(S0, K, T, r, sigma, 50, 'PUT', 'AMERICAN'):.6f}€")
+
+    # Rapport convergence / temps de calcul : erreur par rapport à Black-Scholes en fonction du temps d'exécution
+    schemes = {
+        "CRR": binomial_option_price,
+        "CRR + Richardson (brut)": lambda *args: binomial_option_price_richardson(*args, smoothing=False),
+        "CRR + Richardson (BBS)": binomial_option_price_richardson,
+        "Leisen-Reimer": binomial_option_price_lr,
+    }
+    steps = [10, 25, 50, 100, 250, 500, 1000]
+    n_repeat = 20
+    report = {}
+    print(f"\n{'Schéma':<25} {'M':>6} {'Écart vs BS':>12} {'Temps (ms)':>11}")
+    for name, pricer in schemes.items():
+        report[name] = []
+        for m in steps:
+            durations = []
+            for _ in range(n_repeat):
+                t0 = time.perf_counter()
+                price = pricer(S0, K, T, r, sigma, m, "PUT")
+                durations.append(time.perf_counter() - t0)
+            report[name].append((m, abs(price - put_bs), np.median(durations)))
+            print(f"{name:<25} {m:>6} {abs(price - put_bs):>12.2e} {np.median(durations) * 1e3:>11.3f}")
+
+    # Nombre de pas et temps nécessaires pour atteindre l'écart du CRR à M = 500
+    target = abs(put_price - put_bs)
+    print(f"\nPas et temps nécessaires pour un écart inférieur à {target:.2e}€ (CRR, M=500) :")
+    for name, rows in report.items():
+        reached = [(m, duration) for m, error, duration in rows if error <= target]
+        if reached:
+            print(f"{name:<25} : M = {reached[0][0]:>5}, {reached[0][1] * 1e3:.3f} ms")
+        else:
+            print(f"{name:<25} : non atteint pour M <= {steps[-1]}")
+
+    # Graphique erreur / temps de calcul en échelle log-log
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for name, rows in report.items():
+        ax.loglog([duration for _, _, duration in rows], [error for _, error, _ in rows], 'o-', label=name)
+    ax.set_xlabel('Temps de calcul (secondes)')
+    ax.set_ylabel('Écart absolu avec Black-Scholes (€)')
+    ax.set_title('Convergence des arbres binomiaux : erreur en fonction du temps de calcul')
+    ax.grid(True, which='both', alpha=0.3)
+    ax.legend(loc=0)
+    plt.tight_layout()
+    plt.show()
+
+
+
+
+'''
+Exercice 11 : Grecques extraites d'une seule backward induction
+Calculer delta, gamma et theta par choc et revalorisation multiplie le coût de l'arbre en O(M²).
+Or les nœuds proches de la racine contiennent déjà l'information : les niveaux 1 et 2 de l'arbre donnent delta et gamma
+par différences finies en S, et le nœud central du niveau 2 (même prix S0, deux pas plus tard) donne theta.
+Vega et rho nécessitent de changer σ et r : les quatre scénarios choqués sont valorisés ensemble sur un seul treillis 2D.
+'''
+
+# Grecques par choc et revalorisation (différences centrées, 9 valorisations)
+def bump_and_reprice(S0, K, T, r, sigma, M, option_type="CALL", h_S=0.01, h_T=1 / 365, h_sigma=0.01, h_r=0.001):
+    price = lambda S0=S0, T=T, r=r, sigma=sigma: binomial_option_price(S0, K, T, r, sigma, M, option_type)
+    V0 = price()
+    up, down = price(S0=S0 + h_S * S0), price(S0=S0 - h_S * S0)
+    return {
+        "delta": (up - down) / (2 * h_S * S0),
+        "gamma": (up - 2 * V0 + down) / (h_S * S0) ** 2,
+        "theta": -(price(T=T + h_T) - price(T=T - h_T)) / (2 * h_T),
+        "vega": (price(sigma=sigma + h_sigma) - price(sigma=sigma - h_sigma)) / (2 * h_sigma),
+        "rho": (price(r=r + h_r) - price(r=r - h_r)) / (2 * h_r),
+    }
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 11 : GRECQUES EXTRAITES D'UNE SEULE BACKWARD INDUCTION")
+    print("="*70)
+
+    # Grecques analytiques de Black-Scholes pour le PUT européen (benchmark)
+    greeks_bs = black_scholes_np(S0, K, T, r, sigma, "PUT")
+
+    # Grecques par l'arbre en une seule passe (+ un treillis 2D pour vega et rho)
+    t0 = time.time()
+    put_lattice, greeks_lattice = binomial_option_price(S0, K, T, r, sigma, M, "PUT", greeks=True)
+    t_lattice = time.time() - t0
+
+    t0 = time.time()
+    greeks_bump = bump_and_reprice(S0, K, T, r, sigma, M, "PUT")
+    t_bump = time.time() - t0
+
+    print(f"\nPUT européen : S0={S0}, K={K}, T={T}, r={r}, σ={sigma}, M={M}")
+    print(f"{'Grecque':<8} {'Arbre (1 passe)':>16} {'Choc/revalo.':>14} {'Black-Scholes':>14}")
+    for name in ["delta", "gamma", "theta", "vega", "rho"]:
+        print(f"{name:<8} {greeks_lattice[name]:>16.5f} {greeks_bump[name]:>14.5f} {greeks_bs[name]:>14.5f}")
+    print(f"\nTemps d'exécution grecques par l'arbre   : {t_lattice:.5f} secondes")
+    print(f"Temps d'exécution choc et revalorisation : {t_bump:.5f} secondes (x{t_bump / t_lattice:.1f})")
+
+    # Grecques d'un PUT américain, pour lequel il n'existe pas de formule fermée
+    put_am, greeks_am = binomial_option_price(S0, K, T, r, sigma, M, "PUT", exercise="AMERICAN", greeks=True)
+    print(f"\nPUT américain : prix {put_am:.4f}€, " + ", ".join(f"{name} {value:.5f}" for name, value in greeks_am.items()))
+
+    # Trop peu de pas pour lire les nœuds des niveaux 1 et 2 : erreur explicite
+    try:
+        binomial_option_price(S0, K, T, r, sigma, 2, "PUT", greeks=True)
+    except ValueError as error:
+        print(f"\nM = 2 avec greeks=True : ValueError ({error})")
+
+
+
+
+'''
+Exercice 12 : Black-Scholes-Merton vectorisé avec grecques sur des tableaux
+La fonction black_scholes de l'exercice 6 travaille sur des scalaires (math.log, norm.cdf) et ne retourne que le prix, d1 et d2.
+black_scholes_np valorise des tableaux entiers de contrats (S, K, T, r, σ, type) et retourne prix, delta, gamma, vega,
+theta et rho en une seule passe : les termes intermédiaires (d1, d2, strike actualisé, densité en d1) sont partagés
+et la fonction de répartition normale est évaluée par scipy.special.ndtr.
+C'est le moteur de référence des pricers par arbres (lissage BBS de l'exercice 10, grecques de l'exercice 11) et Monte Carlo.
+'''
 
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 12 : BLACK-SCHOLES-MERTON VECTORISÉ AVEC GRECQUES")
+    print("="*70)
+
+    # Cohérence avec la formule scalaire de l'exercice 6
+    bs_np = black_scholes_np(S0, K, T, r, sigma, np.array(["CALL", "PUT"]))
+    print(f"\nCALL : {bs_np['price'][0]:.6f}€ (scalaire : {call_bs:.6f}€), PUT : {bs_np['price'][1]:.6f}€ (scalaire : {put_bs:.6f}€)")
+    for name in ["delta", "gamma", "vega", "theta", "rho"]:
+        print(f"{name:<6} CALL : {bs_np[name][0]:>10.5f}   PUT : {bs_np[name][1]:>10.5f}")
+
+    # Débit sur un million de contrats aléatoires
+    n_contracts = 1_000_000
+    rng = np.random.default_rng(1000)
+    S_bs = rng.uniform(20., 60., n_contracts)
+    K_bs = rng.uniform(20., 60., n_contracts)
+    T_bs = rng.uniform(0.05, 3., n_contracts)
+    sigma_bs = rng.uniform(0.1, 0.5, n_contracts)
+    type_bs = rng.choice(["CALL", "PUT"], n_contracts)
+
+    t0 = time.time()
+    for s_, k_, t_, v_, o_ in zip(S_bs[:10_000], K_bs[:10_000], T_bs[:10_000], sigma_bs[:10_000], type_bs[:10_000]):
+        black_scholes(s_, k_, t_, r, v_, o_)
+    t_scalar = (time.time() - t0) / 10_000
+    t0 = time.time()
+    bs_book = black_scholes_np(S_bs, K_bs, T_bs, r, sigma_bs, type_bs)
+    t_vect = time.time() - t0
+    print(f"\nFormule scalaire (prix seul)          : {1 / t_scalar:>14,.0f} contrats par seconde")
+    print(f"Formule vectorisée (prix + 5 grecques) : {n_contracts / t_vect:>14,.0f} contrats par seconde ({t_vect:.3f} secondes pour {n_contracts:,} contrats)")
+    print(f"Parité Call-Put vérifiée sur le portefeuille : écart maximal "
+          f"{np.max(np.abs(black_scholes_np(S_bs, K_bs, T_bs, r, sigma_bs, 'CALL', greeks=False)['price'] - black_scholes_np(S_bs, K_bs, T_bs, r, sigma_bs, 'PUT', greeks=False)['price'] - (S_bs - K_bs * np.exp(-r * T_bs)))):.2e}€")
@@ -0,0 +1,213 @@
+'''
+banc_essai.py
+
+Chaque script du Module 0 chronomètre ses variantes avec un seul time.time() autour d'un print : une mesure unique,
+bruitée, qui inclut parfois l'affichage (ou pire, démarre après le calcul). Impossible dans ces conditions de prouver
+qu'une optimisation paie.
+
+Ce banc d'essai unifié mesure les variantes Python / NumPy / Numba des scripts du Module 0 dans les mêmes conditions :
+- échauffement (warm-up) : appels non chronométrés pour charger les noyaux Numba et remplir les caches
+- répétitions : la médiane et l'écart interquartile (IQR) résument la distribution des temps, robustes aux valeurs aberrantes
+- mémoire : pic d'allocation mesuré avec tracemalloc sur un appel séparé (tracemalloc ralentit l'exécution)
+  Attention : les tableaux alloués à l'intérieur d'un noyau Numba ne sont pas vus par tracemalloc.
+- résultats écrits en JSON, et comparaison avec une référence enregistrée pour signaler les régressions
+
+Utilisation :
+    python banc_essai.py                                   # exécute le banc et écrit banc_essai_resultats.json
+    python banc_essai.py --groupes arbre pi                # limite le banc à certains groupes
+    python banc_essai.py --enregistrer-reference           # enregistre les résultats comme référence
+    python banc_essai.py --reference banc_essai_reference.json   # signale les régressions (code de sortie 1)
+'''
+
+
+
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+
+CANDIDATES_60_BITS = np.random.default_rng(0).integers(2 ** 59, 2 ** 60, 10_000, dtype=np.int64) | 1
+
+# Cas de mesure : (groupe, variante, module, fonction, arguments, préparation éventuelle avant chaque appel)
+# Les tailles sont réduites par rapport aux démonstrations pour que les variantes Python pur restent mesurables.
+BENCHMARKS = [
+    ("arbre", "python", "arbres_binomiaux", "simulate_tree", (500,), None),
+    ("arbre", "numpy", "arbres_binomiaux", "simulate_tree_np", (500,), None),
+    ("arbre", "numba", "arbres_binomiaux", "simulate_tree_nb", (500,), None),
+    ("monte_carlo", "python", "simulation_monte_carlo_put_euro", "mcs_simulation_py", ((50, 10_000),), None),
+    ("monte_carlo", "numpy", "simulation_monte_carlo_put_euro", "mcs_simulation_np", ((50, 10_000),), None),
+    ("monte_carlo", "numba", "simulation_monte_carlo_put_euro", "mcs_simulation_nb", ((50, 10_000),), None),
+    ("monte_carlo", "log_cumsum", "simulation_monte_carlo_put_euro", "mcs_simulation_log", ((50, 10_000),), None),
+    ("monte_carlo", "log_cumsum_f32", "simulation_monte_carlo_put_euro", "mcs_simulation_log", ((50, 10_000), np.float32), None),
+    ("monte_carlo", "flux", "simulation_monte_carlo_put_euro", "mcs_put_streaming", (10_000, 50), None),
+    ("pi", "python", "recherches_nb_pi", "mcs_pi_py", (1_000_000,), None),
+    ("pi", "numpy", "recherches_nb_pi", "mcs_pi_np", (1_000_000,), None),
+    ("pi", "numba", "recherches_nb_pi", "mcs_pi_nb", (1_000_000,), None),
+    ("pi", "numba_blocs", "recherches_nb_pi", "mcs_pi_chunked", (1_000_000, 100_000, False), None),
+    # Pire cas de la division d'essai : le premier 10^12 + 39, testé jusqu'à sa racine carrée
+    ("premiers", "division_python", "recherches_nb_premiers", "is_prime", (1_000_000_000_039,), None),
+    ("premiers", "division_numba", "recherches_nb_premiers", "is_prime_nb", (1_000_000_000_039,), None),
+    ("premiers", "miller_rabin", "recherches_nb_premiers", "miller_rabin_nb", (1_000_000_000_039,), None),
+    # Test groupé sur 10 000 candidats impairs de 60 bits : pow(a, d, n) natif contre le noyau en arithmétique de Montgomery
+    ("premiers_64_bits", "python_pow", "recherches_nb_premiers", "miller_rabin_batch_py", (CANDIDATES_60_BITS,), None),
+    ("premiers_64_bits", "montgomery", "recherches_nb_premiers", "miller_rabin_batch_nb", (CANDIDATES_60_BITS,), None),
+    ("fibonacci", "recursif", "recherches_suite_fibonacci", "fib_rec_py1", (22,), None),
+    # Le cache lru_cache est vidé avant chaque appel, sinon seule la première mesure calcule réellement quelque chose
+    ("fibonacci", "recursif_memoise", "recherches_suite_fibonacci", "fib_rec_py2", (300,), "cache_clear"),
+    ("fibonacci", "iteratif", "recherches_suite_fibonacci", "fib_it_py", (300,), None),
+    ("fibonacci", "doublement_rapide", "recherches_suite_fibonacci", "fib_fast_doubling", (300,), None),
+]
+
+# Fichiers par défaut des résultats et de la référence
+RESULTS_FILE = "banc_essai_resultats.json"
+BASELINE_FILE = "banc_essai_reference.json"
+
+
+def measure(func, args=(), setup=None, warmup=1, repeat=7):
+    '''
+    Mesure func(*args) : warmup appels non chronométrés, puis repeat appels chronométrés avec time.perf_counter.
+    setup (optionnel) est appelé avant chaque appel, hors chronométrage.
+    Retourne un dictionnaire : médiane, premier et troisième quartiles, IQR, minimum (secondes) et pic mémoire (octets).
+    '''
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        func(*args)
+
+    times = np.empty(repeat)
+    for i in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        func(*args)
+        times[i] = time.perf_counter() - t0
+
+    # Pic mémoire sur un appel supplémentaire, pour ne pas fausser les temps
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    q1, median, q3 = np.percentile(times, [25, 50, 75])
+    return {
+        "median": float(median),
+        "q1": float(q1),
+        "q3": float(q3),
+        "iqr": float(q3 - q1),
+        "min": float(times.min()),
+        "repeat": repeat,
+        "peak_memory": int(peak),
+    }
+
+
+def run_benchmarks(groups=None, warmup=1, repeat=7):
+    '''
+    Exécute les cas de BENCHMARKS (tous, ou seulement ceux des groupes demandés).
+    Retourne un dictionnaire {"groupe/variante": mesures}, avec l'accélération par rapport à la première variante du groupe.
+    '''
+    results = {}
+    reference = {}
+    for group, variant, module, name, args, setup in BENCHMARKS:
+        if groups and group not in groups:
+            continue
+        func = getattr(importlib.import_module(module), name)
+        stats = measure(func, args, getattr(func, setup) if setup else None, warmup, repeat)
+        reference.setdefault(group, stats["median"])
+        stats["speedup"] = reference[group] / stats["median"]
+        stats["function"] = f"{module}.{name}"
+        results[f"{group}/{variant}"] = stats
+    return results
+
+
+def save_results(results, path):
+    '''
+    Écrit les résultats en JSON, avec le contexte d'exécution (date, versions de Python et NumPy, machine).
+    '''
+    document = {
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare_to_baseline(results, baseline, tolerance=0.10):
+    '''
+    Compare les médianes aux médianes de référence.
+    Un cas est une régression si sa médiane dépasse la référence de plus de tolerance (10 % par défaut)
+    et si l'écart dépasse aussi la dispersion des mesures (le plus grand des deux IQR), pour ne pas signaler du bruit.
+    Retourne {"groupe/variante": (ratio médiane / référence, régression)} pour les cas présents dans la référence.
+    '''
+    comparison = {}
+    for key, stats in results.items():
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        ratio = stats["median"] / base["median"]
+        noise = max(stats["iqr"], base["iqr"])
+        regression = ratio > 1 + tolerance and stats["median"] - base["median"] > noise
+        comparison[key] = (ratio, regression)
+    return comparison
+
+
+def print_report(results, comparison=None):
+    '''
+    Affiche les mesures sous forme de tableau, avec le ratio par rapport à la référence si elle est fournie.
+    '''
+    print(f"\n{'Cas':<30} {'Médiane (ms)':>13} {'IQR (ms)':>10} {'Accél.':>8} {'Pic mémoire (Mo)':>17} {'vs réf.':>9}")
+    for key, stats in results.items():
+        line = (f"{key:<30} {stats['median'] * 1e3:>13.3f} {stats['iqr'] * 1e3:>10.3f} "
+                f"{stats['speedup']:>7.1f}x {stats['peak_memory'] / 1e6:>17.2f}")
+        if comparison and key in comparison:
+            ratio, regression = comparison[key]
+            line += f" {ratio:>8.2f}x" + ("  RÉGRESSION" if regression else "")
+        print(line)
+
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banc d'essai des variantes Python / NumPy / Numba du Module 0")
+    parser.add_argument("--groupes", nargs="+", choices=sorted({case[0] for case in BENCHMARKS}),
+                        help="groupes à mesurer (tous par défaut)")
+    parser.add_argument("--warmup", type=int, default=1, help="appels d'échauffement non chronométrés")
+    parser.add_argument("--repeat", type=int, default=7, help="appels chronométrés par cas")
+    parser.add_argument("--sortie", default=RESULTS_FILE, help="fichier JSON des résultats")
+    parser.add_argument("--reference", help="fichier JSON de référence pour détecter les régressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="hausse relative tolérée de la médiane")
+    parser.add_argument("--enregistrer-reference", action="store_true",
+                        help=f"enregistre aussi les résultats comme référence ({BASELINE_FILE})")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("BANC D'ESSAI DES VARIANTES PYTHON / NUMPY / NUMBA DU MODULE 0")
+    print("="*70)
+
+    results = run_benchmarks(args.groupes, args.warmup, args.repeat)
+    comparison = compare_to_baseline(results, load_results(args.reference), args.tolerance) if args.reference else None
+    print_report(results, comparison)
+
+    save_results(results, args.sortie)
+    print(f"\nRésultats écrits dans {args.sortie}")
+    if args.enregistrer_reference:
+        save_results(results, BASELINE_FILE)
+        print(f"Référence enregistrée dans {BASELINE_FILE}")
+
+    if comparison and any(regression for _, regression in comparison.values()):
+        print("\nDes régressions ont été détectées par rapport à la référence.")
+        sys.exit(1)
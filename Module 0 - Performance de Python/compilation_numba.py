@@ -0,0 +1,61 @@
+'''
+compilation_numba.py
+
+Chaque script du Module 0 accélère une fonction Python avec Numba. Avec numba.jit(fonction), la compilation a lieu
+au premier appel et elle est refaite à chaque lancement du script : le premier appel chronométré inclut donc
+plusieurs secondes de compilation JIT.
+
+Les noyaux sont désormais compilés avec une signature explicite (compilation immédiate, types figés) et un cache disque
+(cache=True) : le code machine est écrit dans le dossier __pycache__ à côté du script (fichiers .nbi / .nbc) puis rechargé
+aux lancements suivants, tant que le fichier source n'a pas été modifié.
+Attention : Numba fige la valeur des variables globales (S0, T, sigma...) au moment de la compilation, le cache ne
+détecte pas leur modification.
+
+Étape de précompilation (optionnelle, au déploiement) : importer les scripts compile et met en cache tous les noyaux.
+    python compilation_numba.py
+'''
+
+
+
+import importlib
+import time
+import numba
+
+
+# Durée de compilation ou de chargement depuis le cache de chaque noyau, et origine du code machine
+compilation_times = {}
+
+def compile_kernel(func, signature, **options):
+    '''
+    Compile immédiatement func pour la signature donnée, avec cache disque.
+    Mesure la durée de l'opération et indique si le code machine provient du cache ou d'une compilation.
+    Les options supplémentaires (parallel=True...) sont transmises à numba.jit.
+    '''
+    t0 = time.perf_counter()
+    kernel = numba.jit(signature, cache=True, **options)(func)
+    duration = time.perf_counter() - t0
+    origin = "cache disque" if kernel.stats.cache_hits else "compilation"
+    compilation_times[func.__name__] = (duration, origin)
+    return kernel
+
+def compilation_report():
+    '''
+    Affiche la durée de compilation (ou de chargement depuis le cache) de chaque noyau compilé dans ce processus,
+    à comparer aux temps d'exécution affichés par les scripts, qui n'incluent plus la compilation.
+    '''
+    print(f"\n{'Noyau':<25} {'Origine':<15} {'Durée (secondes)':>17}")
+    for name, (duration, origin) in compilation_times.items():
+        print(f"{name:<25} {origin:<15} {duration:>17.5f}")
+
+
+# Scripts du Module 0 contenant des noyaux Numba
+MODULES = ["arbres_binomiaux", "simulation_monte_carlo_put_euro", "recherches_nb_pi", "recherches_nb_premiers"]
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("PRÉCOMPILATION DES NOYAUX NUMBA DU MODULE 0")
+    print("="*70)
+    for module in MODULES:
+        importlib.import_module(module)
+    # Les scripts enregistrent leurs durées dans le module importé "compilation_numba", distinct de __main__
+    importlib.import_module("compilation_numba").compilation_report()
@@ -0,0 +1,54 @@
+'''
+monte_carlo_adaptatif.py
+
+Les scripts du Module 0 fixent la taille d'échantillon à l'avance (n = 10_000_000 points pour π, I = 50000 trajectoires
+pour le put) : trop pour un contrat facile, pas assez pour un contrat difficile.
+
+Le pilote adaptatif simule par lots, met à jour la moyenne et la variance en ligne (algorithme de Welford, sous la forme
+de Chan et al. pour fusionner un lot entier à la fois) et s'arrête dès que la demi-largeur de l'intervalle de confiance
+passe sous la tolérance demandée, ou que le budget de temps est épuisé.
+'''
+
+
+
+import math
+import time
+import numpy as np
+
+
+def adaptive_mc(sampler, tol, time_budget=None, batch=100_000, max_samples=None, z=1.96, seed=None):
+    '''
+    Estimation Monte Carlo adaptative.
+    sampler(n, rng) retourne un tableau de n réalisations indépendantes de la quantité à estimer.
+    L'arrêt a lieu dès que z * erreur standard <= tol (z = 1.96 : intervalle de confiance à 95 %),
+    ou que time_budget secondes sont écoulées, ou que max_samples réalisations ont été simulées.
+    Retourne l'estimation, son erreur standard, le nombre de réalisations et la durée en secondes.
+    '''
+    rng = np.random.default_rng(seed)
+    t0 = time.perf_counter()
+    count, mean, m2 = 0, 0.0, 0.0
+    while True:
+        # Le dernier lot est tronqué pour ne pas dépasser max_samples
+        x = sampler(batch if max_samples is None else min(batch, max_samples - count), rng)
+        # Fusion du lot (moyenne et somme des carrés des écarts du lot) avec l'état courant
+        n_b, mean_b = len(x), x.mean()
+        m2_b = ((x - mean_b) ** 2).sum()
+        delta = mean_b - mean
+        total = count + n_b
+        mean += delta * n_b / total
+        m2 += m2_b + delta ** 2 * count * n_b / total
+        count = total
+        std_error = math.sqrt(m2 / max(count - 1, 1) / count)
+        elapsed = time.perf_counter() - t0
+        if (z * std_error <= tol
+                or (time_budget is not None and elapsed >= time_budget)
+                or (max_samples is not None and count >= max_samples)):
+            return mean, std_error, count, elapsed
+
+
+
+
+if __name__ == "__main__":
+    # Tolérance inatteignable : l'arrêt se fait exactement à max_samples, même si ce n'est pas un multiple de batch
+    _, se, count, _ = adaptive_mc(lambda n, rng: rng.standard_normal(n), tol=0., batch=100_000, max_samples=250_000, seed=0)
+    print(f"max_samples=250 000 par lots de 100 000 : {count:,} réalisations, erreur standard {se:.5f}")
@@ -22,13 +22,16 @@ import numpy as np
 from pylab import mpl, plt
 import numba
 import time
+from compilation_numba import compile_kernel, compilation_report
+from monte_carlo_adaptatif import adaptive_mc
 
 
-# Configuration de l'affichage des graphiques
-plt.style.use('seaborn-v0_8')
-mpl.rcParams['font.family'] = 'serif'
+if __name__ == "__main__":
+    # Configuration de l'affichage des graphiques
+    plt.style.use('seaborn-v0_8')
+    mpl.rcParams['font.family'] = 'serif'
 
-print(f'\nValeur réelle de π : {np.pi:.5f}')
+    print(f'\nValeur réelle de π : {np.pi:.5f}')
 
 
 
@@ -37,50 +40,51 @@ print(f'\nValeur réelle de π : {np.pi:.5f}')
 Exercice 1 : Estimation de π par la méthode de Monte Carlo et visualisation des points aléatoires
 '''
 
-print("\n" + "="*100)
-print("Exercice 1 : Estimation de π par la méthode de Monte Carlo et visualisation des points aléatoires")
-print("="*100)
-
-# Génération de points aléatoires (10_000) dans le carré [-1, 1] x [-1, 1]
-rn = [(random.random() * 2 - 1, random.random() * 2 - 1)
-      for _ in range(10_000)]
-
-# Conversion en tableau NumPy pour faciliter les opérations
-rn = np.array(rn)
-print(rn[:5])  
-
-# Visualisation des points et du cercle inscrit
-fig = plt.figure(figsize=(7, 7))
-ax = fig.add_subplot(1,1,1)
-# Tracé le cercle unité 
-circ = plt.Circle((0, 0), radius=1, edgecolor='g', lw=2.0, facecolor='None')
-# Tracé le carré de côté 2
-box = plt.Rectangle((-1, -1), 2, 2, edgecolor='b', alpha=0.3)
-# Tracé le cercle unité 
-ax.add_patch(circ)
-# Tracé le carré de côté 2
-ax.add_patch(box)
-# Dépose les points aléatoires
-plt.plot(rn[:, 0], rn[:, 1], 'r.')
-# Configuration des limites, axes et du titre
-plt.ylim(-1.1, 1.1)
-plt.xlim(-1.1, 1.1)
-plt.xlabel('x')
-plt.ylabel('y') 
-plt.title('Points aléatoires dans un carré et un cercle inscrit')
-plt.grid()
-plt.show()
-
-# Distances des points à l'origine (0, 0)
-distances = np.sqrt(rn[:, 0]**2 + rn[:, 1]**2)
-# Comptage des points qui tombent à l'intérieur du cercle (distance <= 1)
-points_dans_cercle = np.sum(distances <= 1)
-# Estimation de π en multipliant la fraction de points dans le cercle par l'aire du carré (4)
-pi_estime = 4 * points_dans_cercle / len(rn)
-print(f'\nNombre de points : {len(rn)}')
-print(f'Points dans le cercle : {points_dans_cercle}')
-print(f'Fraction de points dans le cercle : {points_dans_cercle / len(rn):.5f}')
-print(f'Estimation de π : {pi_estime:.5f}')
+if __name__ == "__main__":
+    print("\n" + "="*100)
+    print("Exercice 1 : Estimation de π par la méthode de Monte Carlo et visualisation des points aléatoires")
+    print("="*100)
+
+    # Génération de points aléatoires (10_000) dans le carré [-1, 1] x [-1, 1]
+    rn = [(random.random() * 2 - 1, random.random() * 2 - 1)
+          for _ in range(10_000)]
+
+    # Conversion en tableau NumPy pour faciliter les opérations
+    rn = np.array(rn)
+    print(rn[:5])  
+
+    # Visualisation des points et du cercle inscrit
+    fig = plt.figure(figsize=(7, 7))
+    ax = fig.add_subplot(1,1,1)
+    # Tracé le cercle unité 
+    circ = plt.Circle((0, 0), radius=1, edgecolor='g', lw=2.0, facecolor='None')
+    # Tracé le carré de côté 2
+    box = plt.Rectangle((-1, -1), 2, 2, edgecolor='b', alpha=0.3)
+    # Tracé le cercle unité 
+    ax.add_patch(circ)
+    # Tracé le carré de côté 2
+    ax.add_patch(box)
+    # Dépose les points aléatoires
+    plt.plot(rn[:, 0], rn[:, 1], 'r.')
+    # Configuration des limites, axes et du titre
+    plt.ylim(-1.1, 1.1)
+    plt.xlim(-1.1, 1.1)
+    plt.xlabel('x')
+    plt.ylabel('y') 
+    plt.title('Points aléatoires dans un carré et un cercle inscrit')
+    plt.grid()
+    plt.show()
+
+    # Distances des points à l'origine (0, 0)
+    distances = np.sqrt(rn[:, 0]**2 + rn[:, 1]**2)
+    # Comptage des points qui tombent à l'intérieur du cercle (distance <= 1)
+    points_dans_cercle = np.sum(distances <= 1)
+    # Estimation de π en multipliant la fraction de points dans le cercle par l'aire du carré (4)
+    pi_estime = 4 * points_dans_cercle / len(rn)
+    print(f'\nNombre de points : {len(rn)}')
+    print(f'Points dans le cercle : {points_dans_cercle}')
+    print(f'Fraction de points dans le cercle : {points_dans_cercle / len(rn):.5f}')
+    print(f'Estimation de π : {pi_estime:.5f}')
 
 
 
@@ -89,11 +93,6 @@ print(f'Estimation de π : {pi_estime:.5f}')
 Exercice 2 : Estimation de π avec une fonction Python
 '''
 
-print("\n" + "="*70)
-print("Exercice 2 : Estimation de π avec une fonction Python ")
-print("="*70)
-
-n = 10_000_000
 def mcs_pi_py(n):
     circle = 0 
     for _ in range(n):
@@ -102,9 +101,16 @@ def mcs_pi_py(n):
             circle += 1
     return 4 * circle / n
 
-t0 = time.time()
-print(f'\nEstimation de π avec fonction Python et {n} points : {mcs_pi_py(n):.5f}')
-print(f'Temps de calcul : {time.time() - t0:.5f} secondes')
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 2 : Estimation de π avec une fonction Python ")
+    print("="*70)
+
+    n = 10_000_000
+
+    t0 = time.time()
+    print(f'\nEstimation de π avec fonction Python et {n} points : {mcs_pi_py(n):.5f}')
+    print(f'Temps de calcul : {time.time() - t0:.5f} secondes')
 
 
 
@@ -113,45 +119,140 @@ print(f'Temps de calcul : {time.time() - t0:.5f} secondes')
 Exercice 3 : Estimation de π avec Numpy 
 '''
 
-print("\n" + "="*70)
-print("Exercice 3 : Estimation de π avec Numpy")
-print("="*70)
-
-# Génération de points aléatoires avec Numpy
-n = 10_000_000
-# Génération de points aléatoires dans le carré [-1, 1] x [-1, 1]
-rn = np.random.random((n, 2)) * 2 - 1
-# Calcul des distances à l'origine en norme euclidienne pour tous les points
-distance = np.sqrt((rn ** 2).sum(axis=1))
-distance[:8].round(3)
-# Comptage des points qui tombent à l'intérieur du cercle 
-frac = (distance <= 1.0).sum() / len(distance)
-# Estimation de π en multipliant la fraction de points dans le cercle par l'aire du carré (4)
-pi_mcs = frac * 4
-print(f'\nNombre de points : {n}')
-print(f'Points dans le cercle : {(distance <= 1.0).sum()}')
-print(f'Fraction de points dans le cercle : {frac:.5f}')
-t0 = time.time()
-print(f'Estimation de π avec Numpy et {n} points : {pi_mcs:.5f}')
-print(f'Temps de calcul : {time.time() - t0:.5f} secondes')
+# Fonction vectorisée équivalente à mcs_pi_py, comparable aux variantes Python et Numba
+def mcs_pi_np(n):
+    rn = np.random.random((n, 2))
+    return 4 * ((rn ** 2).sum(axis=1) <= 1.0).sum() / n
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 3 : Estimation de π avec Numpy")
+    print("="*70)
+
+    # Génération de points aléatoires avec Numpy
+    n = 10_000_000
+    # Le chronomètre démarre avant la génération des points pour mesurer tout le calcul
+    t0 = time.time()
+    # Génération de points aléatoires dans le carré [-1, 1] x [-1, 1]
+    rn = np.random.random((n, 2)) * 2 - 1
+    # Calcul des distances à l'origine en norme euclidienne pour tous les points
+    distance = np.sqrt((rn ** 2).sum(axis=1))
+    distance[:8].round(3)
+    # Comptage des points qui tombent à l'intérieur du cercle 
+    frac = (distance <= 1.0).sum() / len(distance)
+    # Estimation de π en multipliant la fraction de points dans le cercle par l'aire du carré (4)
+    pi_mcs = frac * 4
+    print(f'\nNombre de points : {n}')
+    print(f'Points dans le cercle : {(distance <= 1.0).sum()}')
+    print(f'Fraction de points dans le cercle : {frac:.5f}')
+    print(f'Estimation de π avec Numpy et {n} points : {pi_mcs:.5f}')
+    print(f'Temps de calcul : {time.time() - t0:.5f} secondes')
+    t0 = time.time()
+    print(f'\nEstimation de π avec la fonction mcs_pi_np et {n} points : {mcs_pi_np(n):.5f}')
+    print(f'Temps de calcul : {time.time() - t0:.5f} secondes')
 
 
 
 
 '''
 Exercice 4 : Estimation de π avec Numba 
+Signature explicite et cache disque : la compilation est faite (ou rechargée) dès la définition et reportée à part.
+'''
+
+mcs_pi_nb = compile_kernel(mcs_pi_py, "float64(int64)")
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 4 : Estimation de π avec Numba")
+    print("="*70)
+
+    t0 = time.time()
+    print(f'\nEstimation de π avec Numba et {n} points : {mcs_pi_nb(n):.5f}')
+    print(f'Temps de calcul : {time.time() - t0:.5f} secondes (hors compilation)')
+    compilation_report()
+
+
+
+
 '''
+Exercice 5 : Estimation de π adaptative, arrêt à une précision cible
+Au lieu de fixer n = 10_000_000 points, les points sont tirés par lots et l'estimation s'arrête dès que la demi-largeur
+de l'intervalle de confiance à 95 % passe sous la tolérance (ou que le budget de temps est épuisé).
+'''
+
+# Réalisations indépendantes de l'estimateur : 4 si le point tombe dans le quart de cercle, 0 sinon
+def pi_samples(n, rng):
+    xy = rng.random((n, 2))
+    return 4.0 * ((xy ** 2).sum(axis=1) <= 1.0)
 
-print("\n" + "="*70)
-print("Exercice 4 : Estimation de π avec Numba")
-print("="*70)
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 5 : Estimation de π adaptative")
+    print("="*70)
 
-mcs_pi_nb = numba.jit(mcs_pi_py)
-t0 = time.time()
-print(f'\nEstimation de π avec Numba et {n} points : {mcs_pi_nb(n):.5f}')
-print(f'Temps de calcul : {time.time() - t0:.5f} secondes')
+    for tol in [1e-2, 1e-3, 5e-4]:
+        pi_est, se, count, elapsed = adaptive_mc(pi_samples, tol, time_budget=10., seed=1)
+        print(f'Tolérance {tol:.0e} : π ≈ {pi_est:.5f} ± {1.96 * se:.5f}, {count:,} points, {elapsed:.3f} secondes')
 
 
 
 
+'''
+Exercice 6 : Estimation de π par blocs, en parallèle et à mémoire bornée
+L'exercice 3 alloue un tableau 10^7 x 2, sa copie au carré et un tableau de distances (~400 Mo) pour compter des points,
+et les exercices 2 et 4 tournent sur une boucle scalaire mono-cœur.
+Ici les points sont comptés par blocs dans un noyau Numba parallèle (prange) : aucun tableau temporaire, la racine carrée
+est évitée en comparant x² + y² à 1, et chaque cœur traite ses propres blocs avec son propre générateur aléatoire.
+Les blocs sont lancés par vagues pour afficher une estimation courante et son erreur : le test passe à 10^10 points.
+'''
 
+# Nombre de points dans le quart de cercle pour chacun des n_chunks blocs de chunk points
+def count_hits(n_chunks, chunk):
+    hits = np.zeros(n_chunks, dtype=np.int64)
+    for c in numba.prange(n_chunks):
+        h = 0
+        for _ in range(chunk):
+            x, y = np.random.random(), np.random.random()
+            if x * x + y * y <= 1.0:
+                h += 1
+        hits[c] = h
+    return hits
+
+count_hits_nb = compile_kernel(count_hits, "int64[:](int64, int64)", parallel=True)
+
+def mcs_pi_chunked(n, chunk=10_000_000, verbose=True):
+    '''
+    Estimation de π sur n points par blocs de chunk points répartis entre les cœurs.
+    Retourne l'estimation, son erreur standard et le nombre de points tirés (n).
+    '''
+    chunk = min(chunk, n)
+    n_chunks, remainder = divmod(n, chunk)
+    wave = 4 * numba.get_num_threads()
+    total_hits, total_points = 0, 0
+    for start in range(0, n_chunks + (remainder > 0), wave):
+        chunks = min(wave, n_chunks - start)
+        if chunks > 0:
+            total_hits += int(count_hits_nb(chunks, chunk).sum())
+            total_points += chunks * chunk
+        # Dernier bloc partiel des n % chunk points restants, lancé avec la dernière vague
+        if start + wave > n_chunks and remainder:
+            total_hits += int(count_hits_nb(1, remainder).sum())
+            total_points += remainder
+        p = total_hits / total_points
+        pi_est, se = 4 * p, 4 * np.sqrt(p * (1 - p) / total_points)
+        if verbose:
+            print(f'{total_points:>16,} points : π ≈ {pi_est:.7f} ± {1.96 * se:.7f}')
+    return pi_est, se, total_points
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("Exercice 6 : Estimation de π par blocs, en parallèle et à mémoire bornée")
+    print("="*70)
+
+    n = 200_000_000
+    print(f'\n{numba.get_num_threads()} thread(s) Numba, {n:,} points (jusqu\'à 10^10 points sans surcoût mémoire)')
+    t0 = time.time()
+    pi_est, se, count = mcs_pi_chunked(n)
+    duration = time.time() - t0
+    print(f'Estimation de π : {pi_est:.7f} (erreur {abs(pi_est - np.pi):.1e}), {count / duration:,.0f} points par seconde')
+    compilation_report()
@@ -1,19 +1,321 @@
+import math
+import time
+import numpy as np
+from compilation_numba import compile_kernel, compilation_report
+
 
 # Recherche de nombres premiers #
 def is_prime(nb):
-    if nb % 2 == 0: return False
+    if nb < 2: return False
+    if nb % 2 == 0: return nb == 2
     for i in range(3, int(nb ** 0.5) + 1, 2):
         if nb % i == 0: return False
     return True
 
 nb = int(13)
-print(nb)
-print(is_prime(nb))
+if __name__ == "__main__":
+    print(nb)
+    print(is_prime(nb))
+
+
+# Recherche de nombres premiers en numba (signature explicite et cache disque) #
+import numba
+is_prime_nb = compile_kernel(is_prime, "boolean(int64)")
+
+if __name__ == "__main__":
+    print(nb)
+    t0 = time.time()
+    print(is_prime_nb(nb))
+    print(f"Temps de calcul : {time.time() - t0:.6f} secondes (hors compilation)")
+    compilation_report()
+
+
+# Crible d'Ératosthène segmenté, impairs seuls et compacté en bits #
+# Le bit i de la plage représente le nombre impair lo + 2i (lo impair) : 16 nombres par octet.
+# La plage est criblée par blocs de block octets, assez petits pour rester dans le cache du processeur,
+# chaque bloc étant barré par les premiers impairs jusqu'à la racine carrée de la borne supérieure.
+def sieve_odd_bits(lo, n_odd, primes, block):
+    bits = np.full((n_odd + 7) // 8, 0xFF, dtype=np.uint8)
+    for block_start in range(0, n_odd, 8 * block):
+        block_end = min(block_start + 8 * block, n_odd)
+        first = lo + 2 * block_start
+        last = lo + 2 * block_end
+        for p in primes:
+            if p * p >= last:
+                break
+            # Premier multiple impair de p dans le bloc, à partir de p²
+            m = max(p * p, (first + p - 1) // p * p)
+            if m % 2 == 0:
+                m += p
+            for k in range((m - lo) // 2, block_end, p):
+                bits[k >> 3] &= ~np.uint8(1 << (k & 7))
+    return bits
+
+sieve_odd_bits_nb = compile_kernel(sieve_odd_bits, "uint8[:](int64, int64, int64[:], int64)")
+
+# Nombre de bits à 1 dans chaque valeur d'octet
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def odd_primes_up_to(limit):
+    '''Premiers impairs <= limit, par un crible simple (limit est de l'ordre de la racine carrée de la plage).'''
+    sieve = np.ones(limit + 1, dtype=bool)
+    sieve[:3] = False
+    sieve[4::2] = False
+    for p in range(3, math.isqrt(limit) + 1, 2):
+        if sieve[p]:
+            sieve[p * p::2 * p] = False
+    return np.flatnonzero(sieve).astype(np.int64)
+
+def sieve_range(a, b, block=1 << 16):
+    '''
+    Crible de [a, b) : retourne lo (premier impair >= a), le nombre n_odd d'impairs de la plage et le tableau de bits,
+    dans lequel le bit i vaut 1 si lo + 2i est premier. Les bits au-delà de n_odd sont à 0.
+    '''
+    lo = max(a, 1) | 1
+    n_odd = max((b - lo + 1) // 2, 0)
+    bits = sieve_odd_bits_nb(lo, n_odd, odd_primes_up_to(math.isqrt(max(b, 1))), block)
+    if lo == 1 and n_odd:
+        bits[0] &= 0xFE                              # 1 n'est pas premier
+    if n_odd % 8:
+        bits[-1] &= (1 << (n_odd % 8)) - 1
+    return lo, n_odd, bits
+
+def count_primes(a, b, window=1 << 28):
+    '''Nombre de premiers dans [a, b), la plage étant criblée par fenêtres de window nombres (mémoire bornée).'''
+    count = int(a <= 2 < b)
+    for start in range(a, b, window):
+        _, _, bits = sieve_range(start, min(start + window, b))
+        count += int(POPCOUNT[bits].sum(dtype=np.int64))
+    return count
+
+def primes_in_range(a, b):
+    '''Tableau des premiers de [a, b).'''
+    lo, n_odd, bits = sieve_range(a, b)
+    odd = lo + 2 * np.flatnonzero(np.unpackbits(bits, bitorder="little")[:n_odd])
+    return np.concatenate(([2], odd)) if a <= 2 < b else odd
+
+SIEVE_SPAN_PER_VALUE = 32                            # Plage criblée au plus 32 fois plus large que le nombre de valeurs
+
+def is_prime_array(values):
+    '''
+    Version vectorisée de is_prime sur un tableau d'entiers, adossée au crible de la plage [min, max] pour les requêtes
+    denses (la mémoire est de (max - min) / 16 octets). Pour des valeurs éparses (plage plus de SIEVE_SPAN_PER_VALUE fois
+    plus large que le nombre de valeurs), chaque valeur est testée par Miller-Rabin.
+    '''
+    values = np.asarray(values, dtype=np.int64)
+    result = values == 2
+    odd = (values & 1).astype(bool) & (values > 1)
+    if odd.any():
+        odd_values = values[odd]
+        if int(odd_values.max()) - int(odd_values.min()) > SIEVE_SPAN_PER_VALUE * len(odd_values):
+            result[odd] = miller_rabin_batch_nb(odd_values)
+            return result
+        lo, _, bits = sieve_range(int(odd_values.min()), int(odd_values.max()) + 1)
+        k = (odd_values - lo) >> 1
+        result[odd] = (bits[k >> 3] >> (k & 7)) & 1 == 1
+    return result
+
+if __name__ == "__main__":
+    print(f"\n2 premier : {is_prime(2)}, 1 premier : {is_prime(1)}")
+    print(f"Premiers de [0, 50) : {primes_in_range(0, 50)}")
+
+    # Requête groupée : primalité de tous les entiers de [0, 10^6)
+    values = np.arange(1_000_000)
+    t0 = time.time()
+    loop = np.array([is_prime_nb(int(v)) for v in values])
+    t_loop = time.time() - t0
+    t0 = time.time()
+    vect = is_prime_array(values)
+    t_sieve = time.time() - t0
+    print(f"\nPrimalité de [0, 10^6) : boucle de divisions {t_loop:.4f} secondes, crible {t_sieve:.4f} secondes "
+          f"(x{t_loop / t_sieve:.0f}), {vect.sum()} premiers, résultats identiques : {np.array_equal(loop, vect)}")
+
+    for b in [10 ** 8, 10 ** 9]:
+        t0 = time.time()
+        print(f"π({b:.0e}) = {count_primes(0, b):,} premiers, {time.time() - t0:.3f} secondes")
+    compilation_report()
+
+
+# Test de Miller-Rabin déterministe sur 64 bits, pour les grands nombres isolés #
+# La division d'essai est en O(√n) : plusieurs secondes vers 10^18. Miller-Rabin avec la base de témoins de Jim Sinclair
+# (2, 325, 9375, 28178, 450775, 9780504, 1795265022) est déterministe pour tout n < 2^64, ici sur des int64 (n < 2^63).
+# Le produit a * b dépasse 64 bits dès que n > √(2^63) : les multiplications modulaires se font alors en arithmétique
+# de Montgomery sur des uint64 (n impair, R = 2^64). Le produit 128 bits est assemblé à partir de moitiés de 32 bits
+# et la réduction n'utilise que des multiplications, des décalages et une soustraction, sans division.
+# Attention : dans un noyau Numba, mélanger uint64 et int64 donne des float64, d'où les constantes typées ci-dessous.
+ZERO, ONE, TWO = np.uint64(0), np.uint64(1), np.uint64(2)
+MASK32, SHIFT32 = np.uint64(0xFFFFFFFF), np.uint64(32)
+
+# Produit complet a * b sur 128 bits, retourné en (poids fort, poids faible)
+def mul_wide(a, b):
+    a_lo, a_hi = a & MASK32, a >> SHIFT32
+    b_lo, b_hi = b & MASK32, b >> SHIFT32
+    p0, p1, p2 = a_lo * b_lo, a_lo * b_hi, a_hi * b_lo
+    mid = (p0 >> SHIFT32) + (p1 & MASK32) + (p2 & MASK32)
+    lo = (p0 & MASK32) | (mid << SHIFT32)
+    hi = a_hi * b_hi + (p1 >> SHIFT32) + (p2 >> SHIFT32) + (mid >> SHIFT32)
+    return hi, lo
+
+mul_wide_nb = compile_kernel(mul_wide, "UniTuple(uint64, 2)(uint64, uint64)")
+
+# Constantes de Montgomery pour n impair < 2^63 : -n^-1 mod 2^64, R mod n (le 1 de Montgomery) et R^2 mod n
+def montgomery_setup(n):
+    inv = n                                          # n * n = 1 mod 8 : 3 bits exacts, doublés à chaque itération de Newton
+    for _ in range(5):
+        inv *= TWO - n * inv
+    r1 = (ZERO - n) % n                              # 2^64 mod n
+    r2 = r1
+    for _ in range(64):                              # r1 * 2^64 mod n par doublements (2 r2 < 2^64 car n < 2^63)
+        r2 += r2
+        if r2 >= n:
+            r2 -= n
+    return ZERO - inv, r1, r2
+
+montgomery_setup_nb = compile_kernel(montgomery_setup, "UniTuple(uint64, 3)(uint64)")
+
+# Produit de Montgomery a * b * R^-1 mod n, pour a, b < n (opérandes à réduire modulo n au préalable)
+def montgomery_mul(a, b, n, n_inv):
+    hi, lo = mul_wide_nb(a, b)
+    m_hi, m_lo = mul_wide_nb(lo * n_inv, n)          # lo + m_lo = 0 mod 2^64 : retenue de 1 dès que lo != 0
+    t = hi + m_hi + (ONE if lo != ZERO else ZERO)    # t < 2n < 2^64
+    return t - n if t >= n else t
+
+montgomery_mul_nb = compile_kernel(montgomery_mul, "uint64(uint64, uint64, uint64, uint64)")
+
+# a^e mod n en représentation de Montgomery (a < n en représentation normale, résultat multiplié par R)
+def montgomery_powmod(a, e, n, n_inv, r1, r2):
+    a = montgomery_mul_nb(a, r2, n, n_inv)
+    result = r1
+    while e > ZERO:
+        if e & ONE:
+            result = montgomery_mul_nb(result, a, n, n_inv)
+        a = montgomery_mul_nb(a, a, n, n_inv)
+        e >>= ONE
+    return result
+
+montgomery_powmod_nb = compile_kernel(montgomery_powmod, "uint64(uint64, uint64, uint64, uint64, uint64, uint64)")
+
+MR_WITNESSES = np.array([2, 325, 9375, 28178, 450775, 9780504, 1795265022], dtype=np.int64)
+SMALL_PRIMES = np.array([2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37], dtype=np.int64)
+
+def miller_rabin(n):
+    if n < 2:
+        return False
+    # Petits diviseurs : élimine rapidement la plupart des composés
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    # n - 1 = d * 2^s avec d impair
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    # n est impair : tous les calculs en représentation de Montgomery, où 1 et n - 1 deviennent r1 et n - r1
+    un = np.uint64(n)
+    n_inv, one, r2 = montgomery_setup_nb(un)
+    minus_one = un - one
+    for a in MR_WITNESSES:
+        a = a % n
+        if a == 0:
+            continue
+        x = montgomery_powmod_nb(np.uint64(a), np.uint64(d), un, n_inv, one, r2)
+        if x == one or x == minus_one:
+            continue
+        for _ in range(s - 1):
+            x = montgomery_mul_nb(x, x, un, n_inv)
+            if x == minus_one:
+                break
+        else:
+            return False
+    return True
+
+miller_rabin_nb = compile_kernel(miller_rabin, "boolean(int64)")
+
+# Référence en Python pur : même algorithme avec l'exponentiation modulaire native pow(a, d, n)
+def miller_rabin_py(n):
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES.tolist():
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in MR_WITNESSES.tolist():
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def miller_rabin_batch_py(values):
+    return np.array([miller_rabin_py(int(v)) for v in values], dtype=np.bool_)
+
+# Point d'entrée groupé : un tableau de candidats testé en parallèle
+def miller_rabin_batch(values):
+    result = np.empty(len(values), dtype=np.bool_)
+    for i in numba.prange(len(values)):
+        result[i] = miller_rabin_nb(values[i])
+    return result
+
+miller_rabin_batch_nb = compile_kernel(miller_rabin_batch, "boolean[:](int64[:])", parallel=True)
 
+if __name__ == "__main__":
+    # Plus petit premier supérieur ou égal à 10^k : pire cas de la division d'essai, qui va jusqu'à √n
+    print(f"\n{'n':>22} {'Division Python':>16} {'Division Numba':>15} {'Miller-Rabin Numba':>19}")
+    for k in [6, 9, 12, 15, 18]:
+        n = 10 ** k + 1
+        while not miller_rabin_nb(n):
+            n += 2
+        timings = []
+        for func, max_k in [(is_prime, 15), (is_prime_nb, 18), (miller_rabin_nb, 18)]:
+            if k > max_k:
+                timings.append("    (trop lent)")
+                continue
+            t0 = time.perf_counter()
+            assert func(n)
+            timings.append(f"{time.perf_counter() - t0:>13.6f} s")
+        print(f"{n:>22} {timings[0]:>16} {timings[1]:>15} {timings[2]:>19}")
 
-# Recherche de nombres premiers en numba #
-import numba    
-is_prime_nb = numba.jit(is_prime)
+    # Test groupé parallèle sur des candidats impairs aléatoires de 60 bits, contre pow(a, d, n) en Python pur
+    candidates = np.random.default_rng(0).integers(2 ** 59, 2 ** 60, 100_000, dtype=np.int64) | 1
+    t0 = time.perf_counter()
+    flags = miller_rabin_batch_nb(candidates)
+    duration = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    flags_py = miller_rabin_batch_py(candidates)
+    duration_py = time.perf_counter() - t0
+    print(f"\n{len(candidates):,} candidats de 60 bits : {flags.sum():,} premiers ({numba.get_num_threads()} thread(s))")
+    print(f"Numba (Montgomery)  : {len(candidates) / duration:>12,.0f} tests par seconde")
+    print(f"Python pur (pow)    : {len(candidates) / duration_py:>12,.0f} tests par seconde (x{duration_py / duration:.1f} plus lent)")
+    print(f"Résultats identiques : {np.array_equal(flags, flags_py)}")
+    # Exponentiation de Montgomery contre pow(a, e, n), pour des modules impairs de 3 à 2^63 (petits compris)
+    rng = np.random.default_rng(1)
+    moduli = (rng.integers(1, 2 ** 62, 1000) >> rng.integers(0, 61, 1000)) * 2 + 1
+    checks = []
+    for n, a, e in zip(moduli.tolist(), rng.integers(0, 2 ** 63 - 1, 1000).tolist(), rng.integers(0, 2 ** 63 - 1, 1000).tolist()):
+        un = np.uint64(n)
+        n_inv, r1, r2 = montgomery_setup_nb(un)
+        x = montgomery_powmod_nb(np.uint64(a % n), np.uint64(e), un, n_inv, r1, r2)
+        checks.append(int(montgomery_mul_nb(x, ONE, un, n_inv)) == pow(a, e, n))
+    print(f"Exponentiation de Montgomery exacte sur 1 000 modules impairs de 2 à 63 bits : {all(checks)}")
+    # Cohérence avec le crible sur une plage dense
+    values = np.arange(2_000_000)
+    print(f"Miller-Rabin identique au crible sur [0, 2.10^6) : {np.array_equal(miller_rabin_batch_nb(values), is_prime_array(values))}")
 
-print(nb)
-print(is_prime_nb(nb))
+    # Valeurs éparses : is_prime_array passe par Miller-Rabin au lieu de cribler toute la plage [3, 10^12 + 39]
+    sparse = np.array([3, 15, 10 ** 12 + 37, 10 ** 12 + 39, 2 ** 61 - 1, 2 ** 61 + 1])
+    t0 = time.time()
+    sparse_result = is_prime_array(sparse)
+    print(f"is_prime_array{sparse.tolist()} : {sparse_result.tolist()} en {time.time() - t0:.4f} secondes, "
+          f"identique à is_prime : {sparse_result.tolist() == [is_prime_nb(int(v)) for v in sparse[:4]] + [True, False]}")
+    compilation_report()
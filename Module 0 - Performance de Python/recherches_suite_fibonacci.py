@@ -2,8 +2,17 @@
 #
 # Nous voyons des manières de plus en plus efficaces de calculer les nombres de Fibonacci en Python
 #
+# Utilisation sans saisie (API et ligne de commande) :
+#   python recherches_suite_fibonacci.py 1000000                          # F(10^6) par doublement rapide, nombre de chiffres
+#   python recherches_suite_fibonacci.py --suite 0 10000 --sortie f.txt   # termes F(0) à F(9999) écrits par lots dans f.txt
+#   python recherches_suite_fibonacci.py --benchmark                      # banc d'essai des méthodes sur grands entiers
+#   python recherches_suite_fibonacci.py --interactif                     # démonstration interactive d'origine
 #
-#
+
+import argparse
+import sys
+import time
+from contextlib import contextmanager
 
 # Simple fonction récursive pour calculer le n-ième nombre de Fibonacci #
 def fib_rec_py1 (n):
@@ -11,9 +20,6 @@ def fib_rec_py1 (n):
         return n
     else : 
         return fib_rec_py1(n - 1) + fib_rec_py1(n - 2)
-print('\n- Première méthode (attention aux nombres au dessus de 32, cela peut être très lent !)')
-n = int(input('Quel est le n-ième nombre de Fibonacci recherché ? '))
-print(f'Le {n}ème nombre de Fibonacci est {fib_rec_py1(n)}\n')
 
 
 # Fonction récursive mémorisée pour calculer le n-ième nombre de Fibonacci #
@@ -24,9 +30,6 @@ def fib_rec_py2 (n):
         return n
     else : 
         return fib_rec_py2(n - 1) + fib_rec_py2(n - 2)
-print('\n- Deuxième méthode (plus rapide grâce à la mémorisation, mais s\'arrête à 999, dépassement de la limite de récursion)')
-n = int(input('Quel est le n-ième nombre de Fibonacci recherché ? '))
-print(f'Le {n}ème nombre de Fibonacci est {fib_rec_py2(n)}\n')
 
 
 # Fonction itérative pour calculer le n-ième nombre de Fibonacci #
@@ -35,9 +38,6 @@ def fib_it_py(n):
     for i in range(1, n + 1 ):
         x, y = y, x + y 
     return x
-print('\n- Troisième méthode (très rapide et sans limite de récursion, mais ne pas dépasser 4300 digits)')
-n = int(input('Quel est le n-ième nombre de Fibonacci recherché ? '))
-print(f'Le {n}ème nombre de Fibonacci est {fib_it_py(n)}\n')
 
 
 # Extra : un générateur pour les nombres de Fibonacci jusqu'au n-ième terme #
@@ -48,5 +48,127 @@ def afficher_suite_fibonacci(n):
         print(a)
         a, b = b, a + b
 
-n = int(input('Jusqu\'à quel terme voulez-vous afficher la suite ? '))
-afficher_suite_fibonacci(n)
+
+
+# Doublement rapide : F(n) en O(log n) multiplications de grands entiers #
+# Avec F(2k) = F(k) * (2 F(k+1) - F(k)) et F(2k + 1) = F(k)² + F(k+1)², on parcourt les bits de n du plus fort au plus faible.
+# Le coût est dominé par les dernières multiplications (Karatsuba en Python) : F(10^6) et ses 208 988 chiffres en une fraction de seconde.
+def fib_fast_doubling(n):
+    return fib_pair(n)[0]
+
+def fib_pair(n):
+    """Retourne (F(n), F(n + 1)), pour n >= 0"""
+    if n < 0:
+        raise ValueError(f"le rang doit être positif ou nul : n = {n}")
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a, b
+
+
+# Générateur borné : termes F(start) à F(stop - 1), seuls deux termes sont gardés en mémoire #
+def fibonacci_range(start, stop):
+    a, b = fib_pair(start)
+    for _ in range(start, stop):
+        yield a
+        a, b = b, a + b
+
+# Python limite par défaut la conversion entier -> texte à 4300 chiffres : levée de la limite le temps d'un bloc, puis restauration #
+@contextmanager
+def unlimited_int_str():
+    previous = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        yield
+    finally:
+        sys.set_int_max_str_digits(previous)
+
+# Nombre de chiffres décimaux estimé sans conversion en texte (conversion quadratique), à une unité près #
+def digit_count(f):
+    return int(f.bit_length() * 0.30102999566398120) + 1
+
+def write_fibonacci(start, stop, file, batch=1000):
+    """Écrit les termes F(start) à F(stop - 1) dans file, une ligne par terme, par lots de batch lignes"""
+    lines = []
+    with unlimited_int_str():
+        for k, f in enumerate(fibonacci_range(start, stop), start):
+            lines.append(f"{k} {f}\n")
+            if len(lines) == batch:
+                file.writelines(lines)
+                lines.clear()
+        file.writelines(lines)
+
+
+# Rang lu en ligne de commande : entier positif ou nul, refusé par argparse sinon #
+def rank(text):
+    n = int(text)
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"rang négatif : {n}")
+    return n
+
+
+# Banc d'essai de l'arithmétique des grands entiers : méthode itérative en O(n) additions contre doublement rapide #
+def benchmark(sizes=(10_000, 100_000, 1_000_000, 10_000_000), max_iterative=100_000):
+    print(f"\n{'n':>12} {'Chiffres (≈)':>12} {'Itératif (s)':>14} {'Doublement rapide (s)':>22}")
+    for n in sizes:
+        t0 = time.perf_counter()
+        f = fib_fast_doubling(n)
+        t_fast = time.perf_counter() - t0
+        if n <= max_iterative:
+            t0 = time.perf_counter()
+            assert fib_it_py(n) == f
+            t_it = f"{time.perf_counter() - t0:>14.5f}"
+        else:
+            t_it = f"{'(trop lent)':>14}"
+        print(f"{n:>12,} {digit_count(f):>12,} {t_it} {t_fast:>22.5f}")
+
+
+# Démonstration interactive d'origine (saisies au clavier) #
+def demo_interactive():
+    print('\n- Première méthode (attention aux nombres au dessus de 32, cela peut être très lent !)')
+    n = int(input('Quel est le n-ième nombre de Fibonacci recherché ? '))
+    print(f'Le {n}ème nombre de Fibonacci est {fib_rec_py1(n)}\n')
+
+    print('\n- Deuxième méthode (plus rapide grâce à la mémorisation, mais s\'arrête à 999, dépassement de la limite de récursion)')
+    n = int(input('Quel est le n-ième nombre de Fibonacci recherché ? '))
+    print(f'Le {n}ème nombre de Fibonacci est {fib_rec_py2(n)}\n')
+
+    print('\n- Troisième méthode (très rapide et sans limite de récursion, mais ne pas dépasser 4300 digits)')
+    n = int(input('Quel est le n-ième nombre de Fibonacci recherché ? '))
+    print(f'Le {n}ème nombre de Fibonacci est {fib_it_py(n)}\n')
+
+    n = int(input('Jusqu\'à quel terme voulez-vous afficher la suite ? '))
+    afficher_suite_fibonacci(n)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Nombres de Fibonacci : doublement rapide, suite par lots, banc d'essai")
+    parser.add_argument("n", type=rank, nargs="?", help="rang du nombre de Fibonacci à calculer")
+    parser.add_argument("--afficher", action="store_true", help="affiche F(n) en entier (sinon son nombre de chiffres)")
+    parser.add_argument("--suite", type=rank, nargs=2, metavar=("DEBUT", "FIN"), help="écrit les termes F(DEBUT) à F(FIN - 1)")
+    parser.add_argument("--sortie", help="fichier de sortie de --suite (sortie standard par défaut)")
+    parser.add_argument("--benchmark", action="store_true", help="compare les méthodes itérative et doublement rapide")
+    parser.add_argument("--interactif", action="store_true", help="démonstration interactive d'origine")
+    args = parser.parse_args()
+
+    if args.interactif:
+        demo_interactive()
+    if args.n is not None:
+        t0 = time.perf_counter()
+        f = fib_fast_doubling(args.n)
+        duration = time.perf_counter() - t0
+        if args.afficher:
+            with unlimited_int_str():
+                print(f)
+        else:
+            print(f"F({args.n}) a environ {digit_count(f):,} chiffres, calculé en {duration:.5f} secondes")
+    if args.suite:
+        if args.sortie:
+            with open(args.sortie, "w", encoding="utf-8") as file:
+                write_fibonacci(*args.suite, file)
+        else:
+            write_fibonacci(*args.suite, sys.stdout)
+    if args.benchmark or not (args.interactif or args.n is not None or args.suite):
+        benchmark()
@@ -10,6 +10,15 @@ import matplotlib.pyplot as plt
 import numba
 import numpy as np
 import math
+import os
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from scipy.special import ndtri
+from scipy.stats import qmc
+from compilation_numba import compile_kernel, compilation_report
+from monte_carlo_adaptatif import adaptive_mc
 
 
 
@@ -32,24 +41,25 @@ def mcs_simulation_py(p):
             S[t, i] = S[t-1, i] * math.exp((r - sigma ** 2 / 2) * dt + sigma * math.sqrt(dt) *rn[t, i])
     return S
 
-S = mcs_simulation_py((M, I))
-print(S)
-print(S[-1].mean())
-print(S0 * math.exp(r * T))
+if __name__ == "__main__":
+    S = mcs_simulation_py((M, I))
+    print(S)
+    print(S[-1].mean())
+    print(S0 * math.exp(r * T))
 
-C0 = math.exp(-r * T) * np.maximum(K - S[-1], 0).mean()
-print(C0)
+    C0 = math.exp(-r * T) * np.maximum(K - S[-1], 0).mean()
+    print(C0)
 
 
-# Graphiques des trajectoires simulées
-plt.figure(figsize=(10, 6))
-plt.hist(S[-1], bins=35, label='frequency')
-plt.axvline(S[-1].mean(), color='r', label='mean value')
-plt.legend(loc=0)
-plt.title('Histogram of the simulated asset prices at maturity')
-plt.xlabel('Asset price at maturity')
-plt.ylabel('Frequency')
-plt.show()
+    # Graphiques des trajectoires simulées
+    plt.figure(figsize=(10, 6))
+    plt.hist(S[-1], bins=35, label='frequency')
+    plt.axvline(S[-1].mean(), color='r', label='mean value')
+    plt.legend(loc=0)
+    plt.title('Histogram of the simulated asset prices at maturity')
+    plt.xlabel('Asset price at maturity')
+    plt.ylabel('Frequency')
+    plt.show()
 
 
 # Variante avec NUMPY vectorisé
@@ -63,15 +73,379 @@ def mcs_simulation_np(p):
         S[t] = S[t-1] * np.exp((r - sigma ** 2 / 2) * dt + sigma * math.sqrt(dt) * rn[t])
     return S
 
-S = mcs_simulation_np((M, I))
-print(S)
-print(S[-1].mean())
+if __name__ == "__main__":
+    S = mcs_simulation_np((M, I))
+    print(S)
+    print(S[-1].mean())
 
 
-# Variante avec NUMBA JIT
-mcs_simulation_nb = numba.jit(mcs_simulation_py)
-S = mcs_simulation_nb((M, I))
-print(S)
-print(S[-1].mean())
-C0 = math.exp(-r * T) * np.maximum(K - S[-1], 0).mean()
-print(C0)
\ No newline at end of file
+# Variante log-espace : une somme cumulée des log-incréments et une seule exponentielle, dans un tampon préalloué
+# Dérive et diffusion sont calculées une seule fois. Les normales sont tirées directement dans le tampon (S[1:]),
+# puis transformées sur place : mise à l'échelle, somme cumulée le long du temps, exponentielle. Aucun tableau
+# intermédiaire de taille (M + 1) x I n'est alloué, et float32 divise encore la mémoire par deux.
+def mcs_simulation_log(p, dtype=np.float64, seed=None):
+    M, I = p
+    dt = T / M
+    drift = (r - sigma ** 2 / 2) * dt
+    vol = sigma * math.sqrt(dt)
+    rng = np.random.default_rng(seed)
+    S = np.empty((M + 1, I), dtype=dtype)
+    log_increments = S[1:]
+    rng.standard_normal(out=log_increments, dtype=dtype)
+    log_increments *= vol
+    log_increments += drift
+    np.cumsum(log_increments, axis=0, out=log_increments)
+    log_increments += math.log(S0)
+    np.exp(log_increments, out=log_increments)
+    S[0] = S0
+    return S
+
+if __name__ == "__main__":
+    for name, func in [("mcs_simulation_np", mcs_simulation_np),
+                       ("mcs_simulation_log float64", mcs_simulation_log),
+                       ("mcs_simulation_log float32", lambda p: mcs_simulation_log(p, np.float32))]:
+        t0 = time.time()
+        S = func((M, I))
+        duration = time.time() - t0
+        C0 = math.exp(-r * T) * np.maximum(K - S[-1], 0).mean()
+        print(f"{name:<27} : {duration:.5f} secondes, {S.nbytes / 1e6:.1f} Mo, prix du put {C0:.4f}")
+
+
+# Variante avec NUMBA JIT (signature explicite et cache disque, la compilation est reportée à part)
+mcs_simulation_nb = compile_kernel(mcs_simulation_py, "float64[:, :](UniTuple(int64, 2))")
+
+if __name__ == "__main__":
+    t0 = time.time()
+    S = mcs_simulation_nb((M, I))
+    print(f"Temps d'exécution Numba (hors compilation) : {time.time() - t0:.5f} secondes")
+    print(S)
+    print(S[-1].mean())
+    C0 = math.exp(-r * T) * np.maximum(K - S[-1], 0).mean()
+    print(C0)
+    compilation_report()
+
+
+# Variante en flux (streaming) à mémoire bornée : le prix du put n'utilise que S[-1]
+# Les trajectoires sont traitées par blocs de taille fixe, en ne gardant que le vecteur des prix courants du bloc,
+# et seules la somme et la somme des carrés des payoffs actualisés sont accumulées : la mémoire est en O(chunk), pas en O(M x I).
+def put_payoff_sums(I, M=1, chunk=1_000_000, seed=None):
+    '''
+    Simule I trajectoires à M pas par blocs de chunk trajectoires et retourne la somme et la somme des carrés
+    des payoffs actualisés du put. seed peut être un entier ou une SeedSequence (flux aléatoire indépendant).
+    '''
+    rng = np.random.default_rng(seed)
+    dt = T / M
+    drift = (r - sigma ** 2 / 2) * dt
+    vol = sigma * math.sqrt(dt)
+    discount = math.exp(-r * T)
+    total, total_sq = 0.0, 0.0
+    for start in range(0, I, chunk):
+        n = min(chunk, I - start)
+        # Log-prix du bloc mis à jour sur place, un tirage de n normales par pas de temps
+        log_S = np.full(n, math.log(S0))
+        for _ in range(M):
+            log_S += drift + vol * rng.standard_normal(n)
+        payoff = discount * np.maximum(K - np.exp(log_S), 0)
+        total += payoff.sum()
+        total_sq += payoff @ payoff
+    return total, total_sq
+
+def mcs_put_streaming(I, M=1, chunk=1_000_000, seed=None):
+    '''
+    Prix Monte Carlo du put européen sur I trajectoires à M pas, traitées par blocs de chunk trajectoires.
+    Avec M=1 (défaut), la valeur terminale est tirée directement (exacte pour la dynamique Black-Scholes).
+    Retourne le prix et son erreur standard.
+    '''
+    total, total_sq = put_payoff_sums(I, M, chunk, seed)
+    price = total / I
+    std_error = math.sqrt((total_sq / I - price ** 2) / (I - 1))
+    return price, std_error
+
+if __name__ == "__main__":
+    # Matrice complète de mcs_simulation_np : trajectoires et nombres aléatoires de taille (M + 1) x I
+    print(f"\nMémoire de mcs_simulation_np pour M={M} et I={I} : {2 * (M + 1) * I * 8 / 1e6:.1f} Mo")
+    for I_stream, M_stream in [(I, M), (10_000_000, 1)]:
+        tracemalloc.start()
+        t0 = time.time()
+        C0, se = mcs_put_streaming(I_stream, M_stream, chunk=1_000_000, seed=42)
+        duration = time.time() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Flux par blocs de 1 000 000, M={M_stream}, I={I_stream:,} : prix {C0:.4f} ± {1.96 * se:.4f} (IC 95 %), "
+              f"erreur standard {se:.5f}, pic mémoire {peak / 1e6:.1f} Mo, {duration:.2f} secondes")
+
+
+# Réduction de variance : variables antithétiques, appariement des moments et variable de contrôle sur S(T)
+# Pour une même erreur standard, un estimateur de variance v / k demande k fois moins de trajectoires que Monte Carlo simple.
+def mcs_put_vr(I, antithetic=False, moment_matching=False, control_variate=False, batches=20, seed=None):
+    '''
+    Prix Monte Carlo du put européen sur I valeurs terminales S(T), avec les techniques de réduction de variance choisies :
+    - antithetic : les tirages z et -z sont appariés, l'estimateur porte sur la moyenne de chaque paire
+    - moment_matching : les tirages sont recentrés et réduits (moyenne 0 et écart-type 1 exacts) dans chacun des batches
+      sous-échantillons indépendants ; les tirages d'un sous-échantillon n'étant plus indépendants, l'erreur standard est
+      celle de la moyenne des batches estimations (méthode des moyennes par lots)
+    - control_variate : S(T), d'espérance connue S0 * e^{rT}, corrige le payoff avec le coefficient optimal
+      beta = cov(payoff, S(T)) / var(S(T)) estimé sur l'échantillon
+    Retourne le prix, son erreur standard et le facteur de réduction de variance mesuré sur les mêmes tirages :
+    variance du payoff simple / variance de l'estimateur ramenée à une valeur terminale.
+    '''
+    rng = np.random.default_rng(seed)
+    n = I // 2 if antithetic else I
+    z_all = rng.standard_normal(n)
+    estimates, sizes, samples, payoffs = [], [], [], []
+    for z in np.array_split(z_all, batches) if moment_matching else [z_all]:
+        if antithetic:
+            z = np.concatenate((z, -z))
+        if moment_matching:
+            z = (z - z.mean()) / z.std()
+        ST = S0 * np.exp((r - sigma ** 2 / 2) * T + sigma * math.sqrt(T) * z)
+        payoff = math.exp(-r * T) * np.maximum(K - ST, 0)
+        payoffs.append(payoff)
+        if antithetic:
+            # Les deux moitiés d'une paire sont dépendantes : l'échantillon indépendant est celui des moyennes de paires
+            half = len(z) // 2
+            payoff = (payoff[:half] + payoff[half:]) / 2
+            ST = (ST[:half] + ST[half:]) / 2
+        if control_variate:
+            beta = np.cov(payoff, ST)[0, 1] / ST.var(ddof=1)
+            payoff = payoff - beta * (ST - S0 * math.exp(r * T))
+        estimates.append(payoff.mean())
+        sizes.append(len(payoff))
+        samples.append(payoff)
+    price = np.average(estimates, weights=sizes)
+    if moment_matching:
+        std_error = np.std(estimates, ddof=1) / math.sqrt(batches)
+    else:
+        std_error = samples[0].std(ddof=1) / math.sqrt(len(samples[0]))
+    payoffs = np.concatenate(payoffs)
+    factor = payoffs.var(ddof=1) / (len(payoffs) * std_error ** 2)
+    return price, std_error, factor
+
+if __name__ == "__main__":
+    I_vr = 1_000_000
+    methods = {
+        "Monte Carlo simple": {},
+        "Antithétiques": {"antithetic": True},
+        "Appariement des moments": {"moment_matching": True},
+        "Variable de contrôle S(T)": {"control_variate": True},
+        "Antithétiques + contrôle": {"antithetic": True, "control_variate": True},
+        "Les trois combinées": {"antithetic": True, "moment_matching": True, "control_variate": True},
+    }
+    print(f"\nRéduction de variance, I={I_vr:,} valeurs terminales (facteur mesuré sur les tirages de chaque méthode)")
+    print(f"{'Méthode':<27} {'Prix':>8} {'Erreur std':>11} {'Facteur':>8} {'Trajectoires pour le même IC':>29}")
+    for name, options in methods.items():
+        C0, se, factor = mcs_put_vr(I_vr, seed=42, **options)
+        print(f"{name:<27} {C0:>8.4f} {se:>11.5f} {factor:>7.1f}x {I_vr / factor:>29,.0f}")
+
+
+# Variante parallèle multi-cœurs et reproductible : un flux aléatoire indépendant par processus
+# Les variantes précédentes tirent leurs nombres dans l'état global np.random et n'utilisent qu'un cœur.
+# Ici les trajectoires sont réparties entre workers processus, chacun recevant une SeedSequence fille issue de spawn :
+# les flux sont statistiquement indépendants, et les sommes sont combinées dans l'ordre des workers,
+# donc le résultat est identique au bit près pour une graine et un nombre de workers donnés.
+def mcs_put_parallel(I, M=1, workers=None, seed=None, chunk=1_000_000):
+    '''
+    Prix Monte Carlo du put européen sur I trajectoires à M pas réparties entre workers processus (par défaut un par cœur).
+    Retourne le prix et son erreur standard.
+    '''
+    workers = workers or os.cpu_count()
+    streams = np.random.SeedSequence(seed).spawn(workers)
+    sizes = [I // workers + (w < I % workers) for w in range(workers)]
+    with ProcessPoolExecutor(workers) as pool:
+        sums = list(pool.map(put_payoff_sums, sizes, [M] * workers, [chunk] * workers, streams))
+    total = sum(s[0] for s in sums)
+    total_sq = sum(s[1] for s in sums)
+    price = total / I
+    std_error = math.sqrt((total_sq / I - price ** 2) / (I - 1))
+    return price, std_error
+
+if __name__ == "__main__":
+    I_par = 10_000_000
+    print(f"\nMonte Carlo parallèle, I={I_par:,} trajectoires, {os.cpu_count()} cœur(s) disponible(s)")
+    for workers in sorted({1, 2, os.cpu_count()}):
+        t0 = time.time()
+        C0, se = mcs_put_parallel(I_par, workers=workers, seed=2024)
+        duration = time.time() - t0
+        # Deuxième calcul avec la même graine et le même nombre de workers : résultat identique au bit près
+        reproducible = mcs_put_parallel(I_par, workers=workers, seed=2024) == (C0, se)
+        print(f"{workers:>3} worker(s) : prix {C0:.6f} (erreur standard {se:.5f}), "
+              f"{I_par / duration:>14,.0f} trajectoires par seconde, reproductible : {reproducible}")
+
+
+# Quasi-Monte Carlo : points de Sobol brouillés et construction par pont brownien
+# Les points de Sobol couvrent l'hypercube [0, 1]^M bien plus régulièrement que des tirages pseudo-aléatoires.
+# Le pont brownien affecte les premières coordonnées (les mieux réparties) aux mouvements qui pèsent le plus sur la trajectoire :
+# W(T) d'abord, puis W(T/2), W(T/4), W(3T/4)... ce qui réduit la dimension effective du problème.
+# Plusieurs répliques indépendamment brouillées (QMC randomisé) fournissent une erreur standard, comme en Monte Carlo.
+def brownian_bridge(z, T):
+    '''
+    Construit les mouvements browniens W(t_1), ..., W(t_M) aux dates t_k = k T / M à partir de normales z de forme (n, M),
+    la colonne 0 fixant W(T) et les suivantes les points milieux, intervalle par intervalle (parcours en largeur).
+    '''
+    n, M = z.shape
+    t = np.linspace(0, T, M + 1)
+    W = np.zeros((n, M + 1))
+    W[:, M] = math.sqrt(T) * z[:, 0]
+    k = 1
+    intervals = deque([(0, M)])
+    while intervals:
+        left, right = intervals.popleft()
+        if right - left < 2:
+            continue
+        mid = (left + right) // 2
+        # Loi de W(t_mid) sachant W(t_left) et W(t_right) : interpolation linéaire plus un bruit gaussien
+        weight = (t[right] - t[mid]) / (t[right] - t[left])
+        std = math.sqrt((t[mid] - t[left]) * (t[right] - t[mid]) / (t[right] - t[left]))
+        W[:, mid] = weight * W[:, left] + (1 - weight) * W[:, right] + std * z[:, k]
+        k += 1
+        intervals.extend([(left, mid), (mid, right)])
+    return W[:, 1:]
+
+def qmc_paths(m, M, seed=None, bridge=True):
+    '''
+    Trajectoires de la dynamique Black-Scholes à partir de 2^m points de Sobol brouillés en dimension M.
+    Avec bridge=False, les normales sont cumulées pas à pas (construction standard).
+    Retourne un tableau (M + 1, 2^m), au même format que mcs_simulation_np.
+    '''
+    u = qmc.Sobol(d=M, scramble=True, seed=np.random.default_rng(seed)).random_base2(m)
+    z = ndtri(u)
+    dt = T / M
+    W = brownian_bridge(z, T) if bridge else np.cumsum(math.sqrt(dt) * z, axis=1)
+    S = np.empty((M + 1, 2 ** m))
+    S[0] = S0
+    S[1:] = S0 * np.exp((r - sigma ** 2 / 2) * dt * np.arange(1, M + 1)[:, None] + sigma * W.T)
+    return S
+
+def mcs_put_qmc(m, M=M, replications=16, seed=None, bridge=True):
+    '''
+    Prix du put européen par QMC randomisé : replications répliques indépendantes de 2^m trajectoires de Sobol brouillées.
+    Retourne le prix (moyenne des répliques) et son erreur standard (écart-type des répliques / racine du nombre de répliques).
+    '''
+    streams = np.random.SeedSequence(seed).spawn(replications)
+    prices = np.array([math.exp(-r * T) * np.maximum(K - qmc_paths(m, M, stream, bridge)[-1], 0).mean()
+                       for stream in streams])
+    return prices.mean(), prices.std(ddof=1) / math.sqrt(replications)
+
+if __name__ == "__main__":
+    print(f"\nQuasi-Monte Carlo randomisé (16 répliques de Sobol brouillé) contre Monte Carlo, M={M} pas")
+    print(f"{'Trajectoires':>12} {'MC err. std':>12} {'QMC err. std':>13} {'QMC + pont':>11} {'Gain (variance)':>16}")
+    for m in range(8, 15, 2):
+        N = 16 * 2 ** m
+        _, se_mc = mcs_put_streaming(N, M, seed=42)
+        _, se_qmc = mcs_put_qmc(m, M, seed=42, bridge=False)
+        C0, se_bb = mcs_put_qmc(m, M, seed=42)
+        print(f"{N:>12,} {se_mc:>12.5f} {se_qmc:>13.5f} {se_bb:>11.5f} {(se_mc / se_bb) ** 2:>15.1f}x")
+    # Le payoff européen ne dépend que de W(T), porté par la première coordonnée de Sobol avec le pont brownien : le gain est maximal
+    print(f"Prix QMC + pont brownien : {C0:.5f}")
+
+
+# Payoffs dépendant de la trajectoire (asiatique, barrière, lookback) calculés en ligne, sans stocker les trajectoires
+# Chaque accumulateur ne garde qu'un état par trajectoire (somme courante, minimum / maximum courant, indicateur de barrière)
+# mis à jour pas à pas pendant la simulation : la mémoire est en O(bloc) quel que soit le nombre de pas M.
+# Interface commune : start(S) avec les prix initiaux du bloc, update(S) à chaque pas, payoff(S) avec les prix à maturité.
+class AsianAccumulator:
+    '''Option asiatique arithmétique à strike fixe, moyenne des prix aux dates t_1, ..., t_M.'''
+    def __init__(self, K, option_type="PUT"):
+        self.K, self.option_type = K, option_type
+    def start(self, S):
+        self.total = np.zeros_like(S)
+        self.steps = 0
+    def update(self, S):
+        self.total += S
+        self.steps += 1
+    def payoff(self, S):
+        average = self.total / self.steps
+        return np.maximum(average - self.K, 0) if self.option_type == "CALL" else np.maximum(self.K - average, 0)
+
+class BarrierAccumulator:
+    '''Option knock-out : payoff vanille, annulé si la barrière est touchée à une date de surveillance ("UP" ou "DOWN").'''
+    def __init__(self, K, barrier, direction="UP", option_type="PUT"):
+        self.K, self.barrier, self.direction, self.option_type = K, barrier, direction, option_type
+    def start(self, S):
+        self.alive = np.ones(S.shape, dtype=bool)
+    def update(self, S):
+        self.alive &= S < self.barrier if self.direction == "UP" else S > self.barrier
+    def payoff(self, S):
+        vanilla = np.maximum(S - self.K, 0) if self.option_type == "CALL" else np.maximum(self.K - S, 0)
+        return np.where(self.alive, vanilla, 0.)
+
+class LookbackAccumulator:
+    '''Option lookback à strike flottant : S(T) - min S(t) pour un Call, max S(t) - S(T) pour un Put.'''
+    def __init__(self, option_type="PUT"):
+        self.option_type = option_type
+    def start(self, S):
+        self.extremum = S.copy()
+    def update(self, S):
+        if self.option_type == "CALL":
+            np.minimum(self.extremum, S, out=self.extremum)
+        else:
+            np.maximum(self.extremum, S, out=self.extremum)
+    def payoff(self, S):
+        return S - self.extremum if self.option_type == "CALL" else self.extremum - S
+
+def mcs_path_dependent(I, M, accumulators, chunk=100_000, seed=None):
+    '''
+    Simule I trajectoires à M pas par blocs de chunk trajectoires, en ne gardant que le vecteur des prix courants du bloc,
+    et alimente chaque accumulateur du dictionnaire {nom: accumulateur} à chaque pas.
+    Retourne {nom: (prix, erreur standard)}.
+    '''
+    rng = np.random.default_rng(seed)
+    dt = T / M
+    drift = (r - sigma ** 2 / 2) * dt
+    vol = sigma * math.sqrt(dt)
+    discount = math.exp(-r * T)
+    sums = {name: [0.0, 0.0] for name in accumulators}
+    for start in range(0, I, chunk):
+        n = min(chunk, I - start)
+        S = np.full(n, S0)
+        for acc in accumulators.values():
+            acc.start(S)
+        for _ in range(M):
+            S *= np.exp(drift + vol * rng.standard_normal(n))
+            for acc in accumulators.values():
+                acc.update(S)
+        for name, acc in accumulators.items():
+            payoff = discount * acc.payoff(S)
+            sums[name][0] += payoff.sum()
+            sums[name][1] += payoff @ payoff
+    results = {}
+    for name, (total, total_sq) in sums.items():
+        price = total / I
+        results[name] = (price, math.sqrt((total_sq / I - price ** 2) / (I - 1)))
+    return results
+
+if __name__ == "__main__":
+    accumulators = {
+        "Put asiatique arithmétique": AsianAccumulator(K, "PUT"),
+        "Put up-and-out (barrière 44)": BarrierAccumulator(K, 44., "UP", "PUT"),
+        "Put lookback (strike flottant)": LookbackAccumulator("PUT"),
+        "Put européen": BarrierAccumulator(K, np.inf, "UP", "PUT"),
+    }
+    I_exo = 1_000_000
+    tracemalloc.start()
+    t0 = time.time()
+    results = mcs_path_dependent(I_exo, M, accumulators, seed=7)
+    duration = time.time() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\nPayoffs exotiques en ligne, I={I_exo:,} trajectoires, M={M} pas : {duration:.2f} secondes, "
+          f"pic mémoire {peak / 1e6:.1f} Mo (trajectoires complètes : {(M + 1) * I_exo * 8 / 1e6:,.0f} Mo)")
+    for name, (price, se) in results.items():
+        print(f"{name:<31} : {price:.4f} (erreur standard {se:.5f})")
+
+    # Contrôle sur les trajectoires complètes de mcs_simulation_log, pour un nombre réduit de trajectoires
+    S = mcs_simulation_log((M, 100_000), seed=7)
+    print(f"Contrôle put asiatique sur trajectoires stockées : {math.exp(-r * T) * np.maximum(K - S[1:].mean(axis=0), 0).mean():.4f}")
+
+
+# Monte Carlo adaptatif : simulation par lots jusqu'à une erreur cible au lieu d'un I fixé
+# Réalisations du payoff actualisé du put à partir des valeurs terminales exactes S(T)
+def put_samples(n, rng):
+    ST = S0 * np.exp((r - sigma ** 2 / 2) * T + sigma * math.sqrt(T) * rng.standard_normal(n))
+    return math.exp(-r * T) * np.maximum(K - ST, 0)
+
+if __name__ == "__main__":
+    print("\nMonte Carlo adaptatif du put (intervalle de confiance à 95 %)")
+    for tol in [5e-2, 1e-2, 2e-3]:
+        C0, se, count, elapsed = adaptive_mc(put_samples, tol, time_budget=5., seed=3)
+        print(f"Tolérance {tol:.0e} : prix {C0:.4f} ± {1.96 * se:.4f}, {count:,} trajectoires, {elapsed:.3f} secondes")
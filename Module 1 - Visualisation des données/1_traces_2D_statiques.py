@@ -9,10 +9,23 @@
 import matplotlib as mpl                                                 # Matplotilib pour les tracés
 import matplotlib.pyplot as plt                                          # Module pyplot pour les tracés
 import seaborn as sns                                                    # Seaborn pour le style des tracés
+import os                                                                # Variables d'environnement
 import numpy as np                                                       # NumPy pour les calculs numériques
 
 
 
+### Mode rapport (RAPPORT_HEADLESS=1) : backend Agg, chaque figure est fermée au lieu d'être affichée ###
+HEADLESS = os.environ.get('RAPPORT_HEADLESS') == '1'                     # Mode rapport sans affichage
+if HEADLESS:
+    mpl.use('Agg')                                                       # Backend sans fenêtre
+
+def show():
+    if HEADLESS:                                                         # Aucun blocage en mode rapport
+        plt.close('all')
+    else:
+        plt.show()
+
+
 ### Configuration du style des tracés ###
 sns.set_style("whitegrid")                                               # Style avec grille blanche
 mpl.rcParams['font.family'] = 'serif'                                    # Police avec empattements
@@ -28,14 +41,14 @@ x = np.arange(len(y))                                                    # Ajout
 plt.figure()                                                             # Création d'une nouvelle figure
 plt.plot(x, y)                                                           # Tracé 2D statiquesimple
 plt.title('Tracé 2D statique simple')                                    # Titre du graphique 
-plt.show()
+show()
 
 
 ### Tracé 2D statique somme cumulée ###
 plt.figure()                                                             # Création d'une nouvelle figure
 plt.plot(y.cumsum())                                                     # Tracé de la somme cumulée des données aléatoires 
 plt.title('Tracé 2D statique somme cumulée')                             # Titre du graphique
-plt.show()
+show()
 
 
 ### Tracé 2D avec style et échelle personnalisé ### 
@@ -44,7 +57,7 @@ plt.plot(y.cumsum())                                                     # Trac
 plt.grid(False)                                                          # Désactive la grille
 plt.axis('equal')                                                        # Mêmes échelles pour x et y
 plt.title('Tracé 2D avec style et échelle personnalisé')                 # Titre du graphique
-plt.show()
+show()
 
 
 ### Tracé 2D avec limites d'axes spécifiques ###
@@ -54,7 +67,7 @@ plt.xlim(-1, 20)                                                         # Limit
 plt.ylim(np.min(y.cumsum()) -1, 
          np.max(y.cumsum()) +1)                                          # Limites de l'axe y
 plt.title("Tracé 2D avec limites d'axes spécifiques")                    # Titre du graphique
-plt.show()
+show()
 
 
 ### Tracé 2D avec taille et labels personnalisée ###
@@ -64,7 +77,7 @@ plt.plot(y.cumsum(), 'ro')                                               # Point
 plt.xlabel('Index')                                                      # Label axe x
 plt.ylabel('Value')                                                      # Label axe y
 plt.title('Tracé 2D avec taille et labels personnalisée')                # Titre du graphique
-plt.show() 
+show()
 
 
 ### Tracé 2D de deux jeux de données ###
@@ -75,7 +88,7 @@ plt.plot(y, 'ro')                                                        # Point
 plt.xlabel('Index')                                                      # Label axe x
 plt.ylabel('Value')                                                      # Label axe y
 plt.title('Tracé 2D de deux jeux de donnée')                             # Titre du graphique
-plt.show()
+show()
 
 
 ### Tracé 2D avec deux jeux de données avec légende ###
@@ -87,7 +100,7 @@ plt.legend(loc=0)                                                        # Lége
 plt.xlabel('Index')                                                      # Label axe x
 plt.ylabel('Value')                                                      # Label axe y
 plt.title('Tracé 2D simple avec deux jeux de données légendés')          # Titre du graphique
-plt.show()
+show()
 
 
 ### Tracé 2D avec plusieurs série avec légende et échelle différente ###
@@ -100,7 +113,7 @@ plt.legend(loc=0)                                                        # Lége
 plt.xlabel('Index')                                                      # Label axe x
 plt.ylabel('Value')                                                      # Label axe y
 plt.title('Tracé 2D avec deux jeux de données et problèmes d\'échelle')  # Titre du graphique
-plt.show()
+show()
 # Pour résoudre le problème d'échelle, on utilise un second axe y #
 fig, ax1 = plt.subplots(figsize=(10, 6))                                 # Taille de la figure
 plt.plot(y[:, 0], 'b', lw=1.5, label='1st')                              # Tracé avec taille personnalisée
@@ -114,7 +127,7 @@ plt.plot(y[:, 1], 'g', lw=1.5, label='2nd')                              # Trac
 plt.plot(y[:, 1], 'ro')                                                  # Points rouges
 plt.legend(loc=0)                                                        # Légende automatique
 plt.ylabel('Value 2nd')                                                  # Label axe y
-plt.show()
+show()
 
 
 ### Tracé 2D avec 2 sous-tracés séparés ###
@@ -131,7 +144,7 @@ plt.plot(y[:, 1], 'ro')                                                  # Point
 plt.legend(loc=0)                                                        # Légende automatique
 plt.xlabel('Index')                                                      # Label axe x
 plt.ylabel('Value')                                                      # Label axe y
-plt.show()
+show()
 
 
 ### Tracé combinant des lignes et des barres d'histogramme ###
@@ -148,7 +161,7 @@ plt.legend(loc=0)                                                        # Lége
 plt.xlabel('Index')                                                      # Label axe x
 plt.title('2nd data set')                                                # Titre du graphique
 plt.suptitle('Tracé combiné : Lignes et Barres')                         # Titre global de la figure
-plt.show()
+show()
 
 
 ### Scatter plot 2D statique (nuage de points) avec plt.plot ###
@@ -158,7 +171,7 @@ plt.plot(y[:, 0], y[:, 1], 'ro')                                         # Trac
 plt.xlabel('1st')                                                        # Label axe x
 plt.ylabel('2nd')                                                        # Label axe y
 plt.title('Scatter plot type plt.plot')                                  # Titre du graphique
-plt.show()
+show()
 
 
 ### Scatter plot 2D statique (nuage de points) avec plt.scatter ###
@@ -167,7 +180,7 @@ plt.scatter(y[:, 0], y[:, 1], marker='o')                                # Trac
 plt.xlabel('1st')                                                        # Label axe x
 plt.ylabel('2nd')                                                        # Label axe y
 plt.title('Scatter plot type plt.scatter')                               # Titre du graphique
-plt.show()
+show()
 
 
 ### Scatter plot 2D statique (nuage de points) avec une troisième dimension ###
@@ -181,7 +194,7 @@ plt.colorbar()                                                           # Ajout
 plt.xlabel('1st')                                                        # Label axe x
 plt.ylabel('2nd')                                                        # Label axe y
 plt.title('Scatter plot avec échelle de couleur')                        # Titre du graphique
-plt.show()
+show()
 
 
 ### Histogramme 2D statique avec deux séries de données ###
@@ -191,7 +204,7 @@ plt.legend(loc=0)                                                        # Lége
 plt.xlabel('Value')                                                      # Label axe x
 plt.ylabel('Frequency')                                                  # Label axe y
 plt.title('Histogramme 2D statique avec deux séries de données')         # Titre du graphique
-plt.show()
+show()
 
 # liste des paramètres que plt.hist peut prendre :
 # plt.hist(x,                                                            # Données à tracer
@@ -225,7 +238,7 @@ plt.legend(loc=0)                                                        # Lége
 plt.xlabel('Value')                                                      # Label axe x
 plt.ylabel('Frequency')                                                  # Label axe y
 plt.title('Histogramme 2D statique empilant deux jeux de données')       # Titre du graphique
-plt.show()
+show()
 
 
 ### Boîte à moustache (boxplot) pour deux jeux de données ###
@@ -235,7 +248,7 @@ plt.setp(ax, xticklabels=['1st', '2nd'])                                 # Label
 plt.xlabel('Data set')                                                   # Label axe x
 plt.ylabel('Value')                                                      # Label axe y
 plt.title('Boîte à moustache pour deux jeux de données')                 # Titre du graphique
-plt.show()
+show()
 # Les ronds indiquent les valeurs aberrantes (outliers) dans le boxplot. 
 
 
@@ -270,4 +283,4 @@ ax.set_xticklabels(('$a$', '$b$'))                                       # Ajout
 ax.set_yticks([func(a), func(b)])                                        # Ajout des lables y
 ax.set_yticklabels(('$f(a)$', '$f(b)$'))                                 # Ajout des lables y
 plt.title('Tracé d\'une fonction exponentielle avec intégrale')          # Titre du graphique
-plt.show()
+show()
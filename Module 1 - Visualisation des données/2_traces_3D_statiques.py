@@ -9,11 +9,25 @@
 import matplotlib as mpl                                                 # Matplotilib pour les tracés 3D
 import matplotlib.pyplot as plt                                          # Module pyplot de Matplotlib
 import seaborn as sns                                                    # Seaborn pour le style des graphiques
+import os                                                                # Variables d'environnement
 import numpy as np                                                       # NumPy pour les calculs numériques
 from mpl_toolkits.mplot3d import Axes3D                                  # Import 3D de Matplotlib 
+from volatilite_implicite import bs_price, iv_surface                    # Solveur de volatilité implicite vectorisé
 
 
 
+### Mode rapport (RAPPORT_HEADLESS=1) : backend Agg, chaque figure est fermée au lieu d'être affichée ###
+HEADLESS = os.environ.get('RAPPORT_HEADLESS') == '1'                     # Mode rapport sans affichage
+if HEADLESS:
+    mpl.use('Agg')                                                       # Backend sans fenêtre
+
+def show():
+    if HEADLESS:                                                         # Aucun blocage en mode rapport
+        plt.close('all')
+    else:
+        plt.show()
+
+
 ### Configuration du style des tracés ###
 sns.set_style("whitegrid")                                               # Style avec grille blanche
 mpl.rcParams['font.family'] = 'serif'                                    # Police avec empattements
@@ -32,9 +46,16 @@ ttm = np.linspace(0.5, 2.5, 24)                                          # Matur
 strike, ttm = np.meshgrid(strike, ttm)                                   # Grilles de strike et ttm
 print(strike[:2].round(1))                                               # Affiche un extrait de la grille strike
 
-# Calcul de la volatilité implicite #
-iv = (strike - 100) ** 2 / (100 * strike) / ttm                          # Calcul de la volatilité implicite
+# Prix des calls sur la grille (à remplacer par les cotations de marché) #
+S0, r = 100., 0.02                                                       # Sous-jacent et taux sans risque
+smile = 0.1 + (strike - 100) ** 2 / (100 * strike) / ttm                 # Smile utilisé pour générer les prix
+prices = bs_price(S0, strike, ttm, r, smile)                             # Prix Black-Scholes des calls
+
+# Calcul de la volatilité implicite : inversion de Black-Scholes sur toute la grille en un appel #
+iv = iv_surface(prices, S0, strike[0], ttm[:, 0], r)                     # Tableau masqué (points non convergés)
 print(iv[:5, :3])                                                        # Affiche un extrait de la matrice iv
+print(f"{iv.count()} / {iv.size} points convergés")                      # Points non masqués
+iv = iv.filled(np.nan)                                                   # Points masqués non tracés
 
 # Tracé 3D de la surface de volatilité implicite #
 fig = plt.figure(figsize=(10, 6))                                        # Taille de la figure
@@ -53,7 +74,7 @@ ax.set_ylabel('time to maturity')                                        # Label
 ax.set_zlabel('implied volatility')                                      # Label axe z
 fig.colorbar(surf, shrink=0.5, aspect=5)                                 # Barre de couleur
 plt.title('Volatilité implicite en 3D')                                  # Titre du graphique
-plt.show()                                                               # Affiche le graphique
+show()                                                                   # Affiche le graphique
 
 
 ### Tracé 3D avec un autre angle de vue ###
@@ -65,5 +86,5 @@ ax.set_xlabel('strike')                                                  # Label
 ax.set_ylabel('time to maturity')                                        # Label axe y
 ax.set_zlabel('implied volatility')                                      # Label axe z
 plt.title('Tracé d\'un nuage de points 3D avec les volatilités induites')# Titre du graphique
-plt.show()                                                               # Affiche le graphique
+show()                                                                   # Affiche le graphique
 
@@ -7,10 +7,14 @@
 
 
 ### Importation des bibliothèques nécessaires ###
+import os                                                                # Variables d'environnement
 import numpy as np                                                       # NumPy pour les calculs numériques
 import pandas as pd                                                      # Pandas pour la manipulation des données
 import plotly.graph_objects as go                                        # Graphiques avec Plotly
 from plotly.offline import plot                                          # Plotly pour les tracés interactifs
+from sous_echantillonnage_plotly import add_series                       # WebGL et sous-échantillonnage des longues séries
+
+AUTO_OPEN = os.environ.get('RAPPORT_HEADLESS') != '1'                   # Mode rapport (RAPPORT_HEADLESS=1) : fichiers HTML sans navigateur
 
 
 
@@ -45,9 +49,9 @@ fig = go.Figure(layout=go.Layout(                                        # Layou
 ))
 ### Ajouter les courbes ###
 for col in df.columns:                                                   # Boucle sur les colonnes du DataFrame
-    fig.add_scatter(x=df.index, y=df[col], name=col)                     # Ajout des courbes au graphique
+    add_series(fig, df.index, df[col], name=col)                         # Ajout des courbes (Scattergl et sous-échantillonnage si longues)
 ### Sauvegarder dans un fichier HTML ###
-plot(fig, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/Trace_en_ligne_séries_temporelles.html', auto_open=True)                        # Sauvegarde et ouverture automatique
+plot(fig, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/Trace_en_ligne_séries_temporelles.html', auto_open=AUTO_OPEN)                        # Sauvegarde et ouverture automatique
 
 
 ### Création d'une figure type histogramme avec Plotly ###
@@ -63,7 +67,7 @@ for col in daily_returns.columns:                                        # Boucl
                       nbinsx=50,                                         # Nombre de bines
                       opacity=0.75)                                      # Ajout des histogrammes au graphique
 ### Sauvegarder dans un fichier HTML ###
-plot(fig, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/Histogramme_des_rendements_quotidiens.html', auto_open=True)                     # Sauvegarde et ouverture automatique
+plot(fig, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/Histogramme_des_rendements_quotidiens.html', auto_open=AUTO_OPEN)                     # Sauvegarde et ouverture automatique
 
 
 # Création d'une figure type boxplot avec Plotly ###
@@ -77,7 +81,7 @@ for col in daily_returns.columns:                                        # Boucl
     fig.add_box(y=daily_returns[col],                                    # Données des rendements
                 name=col)                                                # Ajout des boîtes à moustaches au graphique
 ### Sauvegarder dans un fichier HTML ###
-plot(fig, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/Box_plot_des_rendements_quotidiens.html', auto_open=True)                        # Sauvegarde et ouverture automatique
+plot(fig, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/Box_plot_des_rendements_quotidiens.html', auto_open=AUTO_OPEN)                        # Sauvegarde et ouverture automatique
 
 
 ### Création d'une figure type candlestick avec Plotly ###
@@ -102,18 +106,23 @@ fig.add_candlestick(x=df_ohlc.index,                                     # Dates
                     close=df_ohlc['close'],                              # Données de fermeture
                     name='a')                                            # Ajout du candlestick au graphique
 ### Sauvegarder dans un fichier HTML ###
-plot(fig, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/Graphique_en_chandelier_candlestick.html', auto_open=True)                       # Sauvegarde et ouverture automatique
-
-
-
-
-
-
-
-
-
-
-
-
+plot(fig, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/Graphique_en_chandelier_candlestick.html', auto_open=AUTO_OPEN)                       # Sauvegarde et ouverture automatique
 
 
+### Création d'une figure type tracé en ligne d'une longue série intraday (données à la minute) ###
+# 2 millions de points : un go.Scatter brut produirait un fichier HTML de plusieurs dizaines de Mo et un navigateur figé.
+# add_series passe en Scattergl (WebGL) et sous-échantillonne à la largeur du graphique (LTTB ou min/max par intervalle).
+# Dans Jupyter, go.FigureWidget(fig) + enable_zoom_resampling ré-échantillonne la fenêtre visible à chaque zoom.
+intraday = pd.Series(100 * np.exp(np.random.standard_normal(2_000_000).cumsum() * 0.0005),  # Prix à la minute
+                     index=pd.date_range('2020-1-1', freq='min', periods=2_000_000))        # Index minute
+fig = go.Figure(layout=go.Layout(                                        # Layout personnalisé
+    title='Série intraday à la minute (2 millions de points, sous-échantillonnée)',  # Titre du graphique
+    xaxis_title='Date',                                                  # Titre de l'axe x
+    yaxis_title='Prix'                                                   # Titre de l'axe y
+))
+add_series(fig, intraday.index, intraday.values, name='LTTB')             # Sous-échantillonnage LTTB (forme de la courbe)
+add_series(fig, intraday.index, intraday.values, name='min/max',          # Sous-échantillonnage min/max (extrêmes conservés)
+           method='minmax', visible='legendonly')
+print(f'Points tracés : {len(fig.data[0].x)} sur {len(intraday)} ({type(fig.data[0]).__name__})')
+### Sauvegarder dans un fichier HTML ###
+plot(fig, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/Trace_en_ligne_serie_intraday.html', auto_open=AUTO_OPEN)                            # Sauvegarde et ouverture automatique
@@ -6,11 +6,16 @@
 #
 
 
+import os
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.offline as plyo
 from plotly.subplots import make_subplots
+from sous_echantillonnage_plotly import add_series                      # WebGL et sous-échantillonnage des longues séries
+from indicateurs_techniques import compute_indicators                   # SMA, Bollinger, RSI, ATR, MACD en une passe compilée
+
+AUTO_OPEN = os.environ.get('RAPPORT_HEADLESS') != '1'                  # Mode rapport (RAPPORT_HEADLESS=1) : fichiers HTML sans navigateur
 
 
 # ============================================================
@@ -35,9 +40,9 @@ print()
 # Tracé en ligne d'une série temporelle
 fig1 = go.Figure()
 for col in df.columns:
-    fig1.add_trace(go.Scatter(x=df.index, y=df[col], mode='lines', name=col))
+    add_series(fig1, df.index, df[col], name=col)                      # go.Scatter, ou Scattergl sous-échantillonné si longue série
 fig1.update_layout(title="Figure 7-22 : Line plot (toutes les colonnes)")
-plyo.plot(fig1, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/ply_01.html', auto_open=True)
+plyo.plot(fig1, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/ply_01.html', auto_open=AUTO_OPEN)
 
 # Tracé en ligne avec personnalisations
 fig2 = go.Figure()
@@ -58,7 +63,7 @@ fig2.update_layout(
     yaxis_title='value',                                               # Label axe y
     template='plotly_white',                                           # Thème clair (≈ polar)
 )
-plyo.plot(fig2, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/ply_02.html', auto_open=True)
+plyo.plot(fig2, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/ply_02.html', auto_open=AUTO_OPEN)
 
 # Tracé d'histogrammes par colonne
 fig3 = make_subplots(rows=len(df.columns), cols=1,
@@ -71,7 +76,7 @@ for i, col in enumerate(df.columns, start=1):
     )
 fig3.update_layout(title="Figure 7-24 : Histograms per column",
                    height=250 * len(df.columns), showlegend=False)
-plyo.plot(fig3, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/ply_03.html', auto_open=True)
+plyo.plot(fig3, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/ply_03.html', auto_open=AUTO_OPEN)
 
 
 # =================================================================
@@ -105,16 +110,18 @@ fig4 = go.Figure(data=go.Ohlc(
     name='EUR/USD',
 ))
 fig4.update_layout(title='EUR/USD Exchange Rate', legend=dict(yanchor='top'))
-plyo.plot(fig4, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/qf_01.html', auto_open=True)
+plyo.plot(fig4, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/qf_01.html', auto_open=AUTO_OPEN)
 
 # Tracé OHLC + Bandes de Bollinger
-# Calcul des bandes de Bollinger
+# Calcul des indicateurs (bandes de Bollinger, RSI de Wilder...) en une seule passe par le moteur compilé
 bb_period = 15                                                         # Périodes pour les bandes
 bb_std = 2                                                             # Écarts-types pour la largeur
-sma = quotes['AskClose'].rolling(window=bb_period).mean()
-std = quotes['AskClose'].rolling(window=bb_period).std()
-upper_band = sma + bb_std * std
-lower_band = sma - bb_std * std
+rsi_period = 14                                                        # Période RSI
+indicators = compute_indicators(quotes['AskHigh'], quotes['AskLow'], quotes['AskClose'],
+                                sma_period=bb_period, bb_std=bb_std, rsi_period=rsi_period)
+sma = indicators['sma']
+upper_band = indicators['bb_upper']
+lower_band = indicators['bb_lower']
 
 fig5 = go.Figure()
 fig5.add_trace(go.Ohlc(
@@ -138,18 +145,11 @@ fig5.add_trace(go.Scatter(
     fill='tonexty', fillcolor='rgba(31,119,180,0.1)',                   # Remplissage entre bandes
 ))
 fig5.update_layout(title='EUR/USD + Bollinger Bands', legend=dict(yanchor='top'))
-plyo.plot(fig5, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/qf_02.html', auto_open=True)
+plyo.plot(fig5, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/qf_02.html', auto_open=AUTO_OPEN)
 
 # Tracé OHLC + bandes de Bollinger + RSI
-# Calcul du RSI
-rsi_period = 14                                                         # Période RSI
-delta = quotes['AskClose'].diff()
-gain = delta.where(delta > 0, 0.0)
-loss = (-delta).where(delta < 0, 0.0)
-avg_gain = gain.rolling(window=rsi_period).mean()
-avg_loss = loss.rolling(window=rsi_period).mean()
-rs = avg_gain / avg_loss
-rsi = 100 - (100 / (1 + rs))
+# RSI avec lissage de Wilder, calculé dans la même passe que les bandes de Bollinger
+rsi = indicators['rsi']
 
 fig6 = make_subplots(rows=2, cols=1, shared_xaxes=True,
                      vertical_spacing=0.03,
@@ -191,5 +191,5 @@ fig6.update_yaxes(range=[0, 100], row=2, col=1)
 
 fig6.update_layout(height=700, title='EUR/USD + Bollinger Bands + RSI',
                    legend=dict(yanchor='top'))
-plyo.plot(fig6, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/qf_03.html', auto_open=True)
+plyo.plot(fig6, filename='./Module 1 - Visualisation des données/Test_trace_2D_interactifs/qf_03.html', auto_open=AUTO_OPEN)
 
@@ -0,0 +1,133 @@
+#
+#
+# Couche de construction de graphiques Plotly pour les longues séries de prix
+#
+# Un go.Scatter par colonne avec tous les points bruts : le fichier HTML grossit linéairement avec l'historique
+# et le navigateur ralentit fortement sur des données à la minute (SVG, un élément par point).
+# Ici :
+#   - au-delà d'un seuil de taille, la trace passe en go.Scattergl (rendu WebGL)
+#   - la série est sous-échantillonnée à la largeur en pixels du graphique, par LTTB (Largest Triangle Three Buckets)
+#     ou par min/max par intervalle (conserve les extrêmes, donc les pics)
+#   - dans un go.FigureWidget (Jupyter), chaque zoom ré-échantillonne la fenêtre visible à partir des données complètes :
+#     la pleine résolution est retrouvée dès que la fenêtre contient moins de points que de pixels
+#
+
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+GL_THRESHOLD = 10_000                                                    # Nombre de points au-delà duquel on passe en WebGL
+N_OUT = 2_000                                                            # Points conservés ≈ largeur du graphique en pixels
+
+
+### Conversion de l'axe x en nombres (dates en nanosecondes) pour les calculs d'aires ###
+def _numeric(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+### Positions du minimum et du maximum le long du dernier axe, en ignorant les NaN ###
+### Un intervalle entièrement NaN (trou de cotation) donne son premier indice : le point NaN conservé marque le trou ###
+def _argmin_argmax(values):
+    missing = np.isnan(values)
+    return (np.argmin(np.where(missing, np.inf, values), axis=-1),
+            np.argmax(np.where(missing, -np.inf, values), axis=-1))
+
+
+### Sous-échantillonnage min/max : le minimum et le maximum de chaque intervalle, dans l'ordre chronologique ###
+def minmax_indices(y, n_out):
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    n_buckets = (n_out - 2) // 2                                         # Deux points par intervalle, plus le premier et le dernier
+    if n_buckets < 1:
+        return np.unique([0, n - 1])
+    inner = y[1:n - 1]
+    size = len(inner) // n_buckets                                       # Intervalles de taille égale, le reste va au dernier
+    body = inner[:(n_buckets - 1) * size].reshape(n_buckets - 1, size)
+    offsets = 1 + np.arange(n_buckets - 1) * size
+    idx = np.concatenate([offsets + i for i in _argmin_argmax(body)]
+                         + [1 + (n_buckets - 1) * size + np.array(_argmin_argmax(inner[(n_buckets - 1) * size:]))])
+    return np.unique(np.concatenate(([0, n - 1], idx)))                  # Tri chronologique, premier et dernier points gardés
+
+
+### Sous-échantillonnage LTTB : dans chaque intervalle, le point formant le plus grand triangle ###
+### avec le point retenu précédemment et la moyenne de l'intervalle suivant                      ###
+def lttb_indices(x, y, n_out):
+    x, y = _numeric(x), np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)                 # n_out - 2 intervalles hors premier et dernier points
+    x_mean = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / np.diff(edges)
+    # Moyenne des seuls points cotés de chaque intervalle (NaN si l'intervalle est vide de cotations)
+    finite = ~np.isnan(y[1:n - 1])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        y_mean = (np.add.reduceat(np.where(finite, y[1:n - 1], 0.), edges[:-1] - 1)
+                  / np.add.reduceat(finite.astype(float), edges[:-1] - 1))
+    x_mean, y_mean = np.append(x_mean, x[-1]), np.append(y_mean, y[-1])
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Aire (au facteur 1/2 près) des triangles (point a, candidat, moyenne de l'intervalle suivant)
+        area = np.abs((x[a] - x_mean[b + 1]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (y_mean[b + 1] - y[a]))
+        a = lo + int(np.argmax(np.where(np.isnan(area), -1., area)))      # Aires toutes NaN (trou) : premier point de l'intervalle
+        idx[b + 1] = a
+    return idx
+
+
+def downsample(x, y, n_out=N_OUT, method='lttb'):
+    idx = lttb_indices(x, y, n_out) if method == 'lttb' else minmax_indices(y, n_out)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+
+### Ajout d'une série à une figure : WebGL au-delà du seuil et sous-échantillonnage ###
+def add_series(fig, x, y, name=None, n_out=N_OUT, method='lttb', gl_threshold=GL_THRESHOLD, row=None, col=None, **kwargs):
+    """Ajoute la série (x, y) à fig et retourne (indice de la trace, x, y complets), à passer à enable_zoom_resampling"""
+    x, y = np.asarray(x), np.asarray(y)
+    trace_type = go.Scattergl if len(x) > gl_threshold else go.Scatter
+    x_ds, y_ds = downsample(x, y, n_out, method)
+    kwargs.setdefault('mode', 'lines')
+    fig.add_trace(trace_type(x=x_ds, y=y_ds, name=name, **kwargs), row=row, col=col)
+    return len(fig.data) - 1, x, y
+
+
+### Ré-échantillonnage de la fenêtre visible à chaque zoom (go.FigureWidget dans Jupyter) ###
+def enable_zoom_resampling(fig_widget, series, n_out=N_OUT, method='lttb', xaxis='xaxis'):
+    """series : liste de (indice de trace, x, y) retournés par add_series, x trié par ordre croissant"""
+    def resample(layout, x_range):
+        with fig_widget.batch_update():
+            for trace_index, x, y in series:
+                if x_range is None:                                      # Zoom réinitialisé : série complète
+                    lo, hi = 0, len(x)
+                else:
+                    bounds = np.asarray(pd.to_datetime(list(x_range))) if np.issubdtype(x.dtype, np.datetime64) else np.asarray(x_range, dtype=float)
+                    lo = max(np.searchsorted(x, bounds[0], side='left') - 1, 0)
+                    hi = min(np.searchsorted(x, bounds[1], side='right') + 1, len(x))
+                x_ds, y_ds = downsample(x[lo:hi], y[lo:hi], n_out, method)
+                fig_widget.data[trace_index].x, fig_widget.data[trace_index].y = x_ds, y_ds
+    fig_widget.layout[xaxis].on_change(resample, 'range')
+    return fig_widget
+
+
+
+
+if __name__ == "__main__":
+    # Série à la minute avec une plage de cotations manquantes (NaN) : les deux méthodes conservent le trou
+    x = pd.date_range('2024-01-02 09:30', periods=500_000, freq='min')
+    y = 100 + np.random.standard_normal(len(x)).cumsum() * 0.01
+    y[200_000:220_000] = np.nan
+    for method in ['lttb', 'minmax']:
+        x_ds, y_ds = downsample(x, y, method=method)
+        print(f"{method:<7}: {len(y_ds)} points (n_out = {N_OUT}), dont {np.isnan(y_ds).sum()} NaN (trou conservé), "
+              f"min {np.nanmin(y_ds):.4f} / {np.nanmin(y):.4f}, max {np.nanmax(y_ds):.4f} / {np.nanmax(y):.4f}")
+    fig = go.Figure()
+    add_series(fig, x, y, name='avec trou')
+    print(f"add_series : trace {type(fig.data[0]).__name__} de {len(fig.data[0].x)} points")
@@ -0,0 +1,154 @@
+#
+#
+# Moteur de volatilité implicite vectorisé (inversion de Black-Scholes sur une grille strike x maturité)
+#
+# Une inversion point par point (scipy.optimize.brentq dans une boucle) coûte des dizaines d'évaluations de
+# Black-Scholes par option et autant d'appels Python : inutilisable pour reconstruire les surfaces de centaines de
+# sous-jacents toutes les quelques secondes. Ici toute la grille est inversée en un seul appel sur des tableaux :
+#   - point de départ rationnel (approximation de Corrado-Miller), déjà proche de la solution près de la monnaie
+#   - itérations de Halley (vega et volga analytiques), convergence cubique
+#   - garde-fou : un intervalle [bas, haut] encadrant la solution est mis à jour à chaque itération, et tout pas qui
+#     en sort (vega quasi nulle loin de la monnaie) est remplacé par une bissection
+#   - seuls les points non convergés restent actifs d'une itération à l'autre
+#   - les prix hors des bornes d'arbitrage, les points non convergés et les points mal conditionnés (valeur temps au niveau
+#     de l'arrondi du prix, vega trop faible pour que la volatilité soit déterminée) sont masqués (numpy.ma)
+#
+
+
+import time
+import numpy as np
+from scipy.special import ndtr
+
+
+SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+### Prix Black-Scholes vectorisé (dividende continu q) ###
+def bs_price(S, K, T, r, sigma, option_type='call', q=0.):
+    S, K, T, r, sigma, q = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, K, T, r, sigma, q)))
+    sqrt_T = np.sqrt(T)
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
+    call = S * np.exp(-q * T) * ndtr(d1) - K * np.exp(-r * T) * ndtr(d2)
+    if option_type == 'call':
+        return call
+    return call - S * np.exp(-q * T) + K * np.exp(-r * T)                # Parité call-put
+
+
+### Volatilité implicite : Halley sécurisé par encadrement, sur tous les points à la fois ###
+def implied_volatility(price, S, K, T, r=0., option_type='call', q=0., tol=1e-10, max_iter=50,
+                       sigma_min=1e-4, sigma_max=5., vol_precision=1e-4):
+    """
+    Inverse Black-Scholes sur des tableaux de prix (toute forme, diffusés avec S, K, T, r, q).
+    Retourne un tableau masqué (numpy.ma) : points hors bornes d'arbitrage, non convergés, ou mal conditionnés
+    (valeur temps au niveau de la précision machine, ou arrondi du prix / vega > vol_precision) masqués.
+    """
+    price, S, K, T, r, q = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (price, S, K, T, r, q)))
+    shape = price.shape
+    # Travail en forward actualisé sur des calls : F = S e^(-qT), X = K e^(-rT), un put est converti par parité
+    F, X = (S * np.exp(-q * T)).ravel(), (K * np.exp(-r * T)).ravel()
+    C = price.ravel() if option_type == 'call' else (price + S * np.exp(-q * T) - K * np.exp(-r * T)).ravel()
+    sqrt_T = np.sqrt(T).ravel()
+    log_fx = np.log(F / X)
+
+    def call_vega(sigma, idx):
+        # Prix du call, vega et d1, d2 sur les points idx (actualisation incluse dans F et X)
+        v = sigma * sqrt_T[idx]
+        d1 = log_fx[idx] / v + 0.5 * v
+        d2 = d1 - v
+        call = F[idx] * ndtr(d1) - X[idx] * ndtr(d2)
+        vega = F[idx] * np.exp(-0.5 * d1 ** 2) / SQRT_2PI * sqrt_T[idx]
+        return call, vega, d1, d2
+
+    time_value = C - np.maximum(F - X, 0.)
+    sigma = np.full(C.shape, np.nan)
+    converged = np.zeros(C.shape, dtype=bool)
+
+    # Bornes d'arbitrage : max(F - X, 0) < C < F, et solution dans [sigma_min, sigma_max]
+    # Une valeur temps de l'ordre de l'arrondi du prix ne contient plus d'information sur la volatilité
+    rounding = 8 * np.finfo(float).eps * np.maximum(C, np.maximum(F, X))
+    idx = np.flatnonzero((time_value > rounding) & (C < F) & (sqrt_T > 0))
+    lo, hi = np.full(idx.size, sigma_min), np.full(idx.size, sigma_max)
+    inside = (call_vega(lo, idx)[0] <= C[idx]) & (C[idx] <= call_vega(hi, idx)[0])
+    idx, lo, hi = idx[inside], lo[inside], hi[inside]
+
+    # Point de départ de Corrado-Miller (racine tronquée à 0 loin de la monnaie, où elle devient négative)
+    c, f, x = C[idx], F[idx], X[idx]
+    half = c - 0.5 * (f - x)
+    guess = SQRT_2PI / ((f + x) * sqrt_T[idx]) * (half + np.sqrt(np.maximum(half ** 2 - (f - x) ** 2 / np.pi, 0.)))
+    s = np.clip(guess, lo, hi)
+
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+        call, vega, d1, d2 = call_vega(s, idx)
+        diff = call - C[idx]
+        # Resserrement de l'encadrement : le prix est croissant en sigma
+        hi = np.where(diff > 0, s, hi)
+        lo = np.where(diff <= 0, s, lo)
+        # Pas de Halley : volga / vega = d1 d2 / sigma
+        with np.errstate(all='ignore'):
+            newton = diff / vega
+            step = newton / (1 - 0.5 * newton * d1 * d2 / s)
+        s_new = s - step
+        bad = ~np.isfinite(s_new) | (s_new <= lo) | (s_new >= hi)
+        s_new = np.where(bad, 0.5 * (lo + hi), s_new)                    # Bissection si le pas sort de l'encadrement
+
+        # Convergence : écart de prix relatif à la valeur temps (mal conditionné loin de la monnaie), ou pas / encadrement négligeable
+        priced = np.abs(diff) <= tol * time_value[idx]
+        done = priced | (np.abs(s_new - s) <= tol * s) | (hi - lo <= tol * s)
+        sigma[idx[done]] = np.where(priced[done], s[done], s_new[done])
+        converged[idx[done]] = True
+        keep = ~done
+        idx, s, lo, hi = idx[keep], s_new[keep], lo[keep], hi[keep]
+
+    # Conditionnement : une erreur d'arrondi sur le prix déplace la volatilité d'environ arrondi / vega
+    idx = np.flatnonzero(converged)
+    vega = call_vega(sigma[idx], idx)[1]
+    with np.errstate(divide='ignore'):
+        converged[idx] = rounding[idx] / vega <= vol_precision
+    return np.ma.masked_array(sigma, mask=~converged).reshape(shape)
+
+
+### Surface de volatilité implicite d'un sous-jacent sur une grille strike x maturité ###
+def iv_surface(prices, S, strikes, ttm, r=0., option_type='call', q=0., **kwargs):
+    """prices : tableau (maturités, strikes), ou (sous-jacents, maturités, strikes) avec S de forme (sous-jacents, 1, 1)"""
+    strike, maturity = np.meshgrid(strikes, ttm)
+    return implied_volatility(prices, S, strike, maturity, r, option_type, q, **kwargs)
+
+
+
+
+if __name__ == "__main__":
+    # 500 sous-jacents, grille de 24 strikes x 24 maturités, prix issus d'un smile connu : précision et débit du solveur
+    n_underlyings = 500
+    rng = np.random.default_rng(1000)
+    S = rng.uniform(50, 150, (n_underlyings, 1, 1))
+    moneyness = np.linspace(0.5, 1.5, 24)
+    ttm = np.linspace(0.1, 2.5, 24)
+    K = S * moneyness
+    T = ttm[:, None]
+    sigma_true = 0.1 + 0.25 * np.log(K / S) ** 2 / np.sqrt(T) + rng.uniform(0.05, 0.3, (n_underlyings, 1, 1))
+    calls = bs_price(S, K, T, 0.02, sigma_true)
+    puts = bs_price(S, K, T, 0.02, sigma_true, option_type='put')
+
+    implied_volatility(calls[:2], S[:2], K[:2], T, 0.02)                 # Premier appel hors chronométrage
+    t0 = time.perf_counter()
+    iv = implied_volatility(calls, S, K, T, 0.02)
+    t_call = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    iv_put = implied_volatility(puts, S, K, T, 0.02, option_type='put')
+    t_put = time.perf_counter() - t0
+
+    # Référence : brentq point par point sur une seule surface
+    from scipy.optimize import brentq
+    t0 = time.perf_counter()
+    for i, j in np.ndindex(calls.shape[1:]):
+        brentq(lambda v: bs_price(S[0, 0, 0], K[0, 0, j], T[i, 0], 0.02, v) - calls[0, i, j], 1e-4, 5.)
+    t_brentq = (time.perf_counter() - t0) * n_underlyings
+
+    print(f"{calls.size} options ({n_underlyings} surfaces de 24 x 24)")
+    print(f"brentq point par point (extrapolé) : {t_brentq:7.1f} s")
+    print(f"Calls : {t_call * 1e3:7.1f} ms, {iv.count()} convergés, écart maximal {np.abs(iv - sigma_true).max():.2e}")
+    print(f"Puts  : {t_put * 1e3:7.1f} ms, {iv_put.count()} convergés, écart maximal {np.abs(iv_put - sigma_true).max():.2e}")
+    print(f"Prix hors bornes d'arbitrage masqué : {implied_volatility(0.5, 100., 50., 1.).mask}")
@@ -13,6 +13,7 @@ import pandas as pd
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import yfinance as yf
+from rapport_figures import show                 # plt.show(), ou fermeture de la figure en mode headless (RAPPORT_HEADLESS=1)
 
 
 plt.style.use('seaborn-v0_8')  
@@ -104,7 +105,7 @@ data.plot(figsize=(10, 12), subplots=True)
 plt.suptitle('Séries temporelles financières en tracé multiple en ligne', y=1.01)
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_Tracé_multiple_en_ligne.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 # Liste des instruments et leurs Tickers format tableau
 print("\n=== Liste des instruments ===")
@@ -140,7 +141,7 @@ data.pct_change().mean().plot(kind='bar', figsize=(10, 6))
 plt.title('Bar plot des rendements moyens quotidiens')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_Barplot_rendements_moyens_quotidiens.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 
 
@@ -171,7 +172,7 @@ plt.title('Évolution cumulative des rendements logarithmiques')
 plt.ylabel('Prix normalisé')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_Evolution_cumulative_rendements_logarithmiques.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 # Rééchantillonnage hebdomadaire (weekly) #
 # EOD (End of Day) data rééchantillonnée en intervalles hebdomadaires
@@ -192,7 +193,7 @@ plt.title('Évolution cumulative des rendements logarithmiques (rééchantillonn
 plt.ylabel('Prix normalisé')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_Evolution_cumulative_rendements_logarithmiques_mensuel.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 '''
 NOTE IMPORTANTE SUR LE RÉÉCHANTILLONNAGE :
@@ -12,6 +12,7 @@ import pandas as pd
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import yfinance as yf
+from rapport_figures import show                 # plt.show(), ou fermeture de la figure en mode headless (RAPPORT_HEADLESS=1)
 
 
 plt.style.use('seaborn-v0_8')  
@@ -114,7 +115,7 @@ plt.title('Prix de l\'action Apple et statistiques mobiles')
 # Ajustement de la mise en page pour éviter les chevauchements
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_Statistiques_mobiles_Apple.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 
 
@@ -148,7 +149,7 @@ data[[sym, 'SMA1', 'SMA2']].plot(figsize=(10, 6))
 plt.title('Prix de l\'action Apple et deux moyennes mobiles simples (SMA)')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_Apple_&_SMA.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 '''
 Les SMA servent surtout à trouver des positions à adopter sur les marchés financiers.
@@ -171,4 +172,4 @@ ax.get_legend().set_bbox_to_anchor((0.25, 0.85))
 plt.title('Prix de l\'action Apple, deux SMA et positions longues/courtes')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_Apple_&_SMA_positions.png', dpi=150, bbox_inches='tight')
-plt.show()
\ No newline at end of file
+show()
\ No newline at end of file
@@ -16,6 +16,8 @@ import pandas as pd
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import yfinance as yf
+from matrice_densite import density_scatter_matrix  # Scatter matrix par histogrammes 2D (densité)
+from rapport_figures import show                    # plt.show(), ou fermeture de la figure en mode headless (RAPPORT_HEADLESS=1)
 
 
 plt.style.use('seaborn-v0_8')
@@ -48,7 +50,7 @@ data.plot(subplots=True, figsize=(10, 6))
 plt.suptitle('Données temporelles S&P 500 et VIX (subplots)')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_SPX_VIX_subplots.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 # Deux séries S&P 500 et VIX sur le même tracé avec double axe Y
 # .loc[:'DATE'] sélectionne les données jusqu'à la date demandée
@@ -56,7 +58,7 @@ data.loc[:'2012-12-31'].plot(secondary_y='.VIX', figsize=(10, 6))
 plt.title('Données temporelles S&P 500 et VIX (double axe Y)')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_SPX_VIX_double_axe_y.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 
 
@@ -87,18 +89,19 @@ rets.plot(subplots=True, figsize=(10, 6))
 plt.suptitle('Rendements logarithmiques du S&P 500 et du VIX (subplots)')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_SPX_VIX_log_returns_subplots.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
-# Affichage graphique des rendements logarithmiques sous forme de scatter matrix
+# Affichage graphique des rendements logarithmiques sous forme de scatter matrix par densité
+# Chaque paire est agrégée en histogramme 2D affiché en image, au lieu d'un marqueur par point (pd.plotting.scatter_matrix) :
+# le temps de rendu reste le même avec des années de rendements intraday sur 12 instruments
 # rets : jeu de données à visualiser 
-# alpha : paramètre alpha pour l'opacité des points 
-# diagonal : type de graphique à afficher sur la diagonale (ici des histogrammes)
-# hist_kwds : paramètres pour les histogrammes (ici le nombre de bins)
-pd.plotting.scatter_matrix(rets, alpha=0.2, diagonal='hist', hist_kwds={'bins': 35}, figsize=(10, 6))
+# bins : nombre de classes par axe des histogrammes 2D
+# diagonal_bins : nombre de classes des histogrammes de la diagonale
+density_scatter_matrix(rets, bins=35, diagonal_bins=35, figsize=(10, 6))
 plt.suptitle('Scatter matrix des rendements logarithmiques du S&P 500 et du VIX')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_SPX_VIX_log_returns_scatter_matrix.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 
 
@@ -120,7 +123,7 @@ ax.plot(rets['.SPX'], np.polyval(reg, rets['.SPX']), 'r', lw=2)
 plt.title('OLS Regression VIX log returns et S&P 500 log returns')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_SPX_VIX_log_returns_ols_regression.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 
 
@@ -146,4 +149,4 @@ plt.title('Corrélation statique et mobile entre les rendements logarithmiques d
 plt.ylabel('Correlation')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_SPX_VIX_log_returns_rolling_correlation.png', dpi=150, bbox_inches='tight')
-plt.show()
\ No newline at end of file
+show()
\ No newline at end of file
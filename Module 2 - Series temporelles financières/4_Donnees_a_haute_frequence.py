@@ -19,6 +19,7 @@ import pandas as pd
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import yfinance as yf
+from rapport_figures import show                 # plt.show(), ou fermeture de la figure en mode headless (RAPPORT_HEADLESS=1)
 
 
 plt.style.use('seaborn-v0_8')
@@ -54,7 +55,7 @@ plt.title('Données de tick pour le taux de change EUR/USD')
 plt.ylabel('Mid Price')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_tick_mid_EURUSD.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 
 
@@ -78,6 +79,6 @@ plt.title('Données rééchantillonnées toutes les 5 minutes pour le taux de ch
 plt.ylabel('Mid Price')
 plt.tight_layout()
 plt.savefig('./Module 2 - Series temporelles financières/Figures_series_temporelles_financieres/fig_tick_resam_5min_EURUSD.png', dpi=150, bbox_inches='tight')
-plt.show()
+show()
 
 
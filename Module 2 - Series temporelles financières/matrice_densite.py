@@ -0,0 +1,111 @@
+'''
+Module 2 - Financial Time Series
+matrice_densite :
+
+Scatter matrix par densité pour les grands ensembles de rendements.
+
+pd.plotting.scatter_matrix trace chaque point dans chaque panneau : avec 12 instruments et des années de rendements
+intraday, des millions de marqueurs semi-transparents et plusieurs minutes de rendu, pour une figure où les points se
+recouvrent de toute façon. Ici chaque paire d'instruments est agrégée en histogramme 2D :
+- les indices de classe de chaque colonne sont calculés une seule fois, en une passe vectorisée
+- l'histogramme 2D d'une paire est un np.bincount sur les indices combinés (classe x * bins + classe y)
+- chaque panneau est affiché comme une image (imshow), à échelle de couleur logarithmique pour garder les queues visibles
+Le coût de rendu ne dépend plus que du nombre de classes : il reste constant quand le nombre de points augmente,
+seul le comptage (linéaire, en C) suit la taille des données.
+'''
+
+
+import io
+import time
+
+import numpy as np
+import pandas as pd
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+
+
+def bin_indices(values, bins, clip):
+    '''Indices de classe (0 à bins - 1) d'une colonne, sur l'intervalle des quantiles [clip, 1 - clip] ; -1 hors intervalle ou NaN.'''
+    lo, hi = np.nanquantile(values, [clip, 1 - clip]) if clip > 0 else (np.nanmin(values), np.nanmax(values))
+    if hi <= lo:
+        hi = lo + 1.
+    scaled = (values - lo) * (bins / (hi - lo))
+    with np.errstate(invalid='ignore'):
+        idx = np.where((scaled >= 0) & (scaled <= bins), np.minimum(scaled, bins - 1), -1)
+    return idx.astype(np.int64), (lo, hi)
+
+def density_scatter_matrix(data, bins=64, diagonal_bins=35, kind='hist', clip=0.001, cmap='viridis', figsize=(10, 6)):
+    '''
+    Équivalent de pd.plotting.scatter_matrix où chaque paire de colonnes est tracée comme une densité :
+    kind='hist' : histogramme 2D calculé par np.bincount et affiché en image
+    kind='hexbin' : hexagones de matplotlib (ax.hexbin), même principe d'agrégation mais comptage plus coûteux
+    clip : fraction de points extrêmes exclue de chaque axe (quantiles), pour que quelques rendements extrêmes n'écrasent
+    pas la densité. Retourne le tableau des axes, comme scatter_matrix.
+    '''
+    df = pd.DataFrame(data)
+    values = df.to_numpy(dtype=float)
+    n_cols = values.shape[1]
+    indices, ranges = zip(*(bin_indices(values[:, j], bins, clip) for j in range(n_cols)))
+
+    fig, axes = plt.subplots(n_cols, n_cols, figsize=figsize, squeeze=False)
+    pair_counts = {}
+    for i in range(n_cols):                                              # Ligne : variable en ordonnée
+        for j in range(n_cols):                                          # Colonne : variable en abscisse
+            ax = axes[i, j]
+            if i == j:
+                # Diagonale : histogramme de la variable, sur le même intervalle que les panneaux
+                counts, edges = np.histogram(values[:, j], bins=diagonal_bins, range=ranges[j])
+                ax.stairs(counts, edges, fill=True, alpha=0.7)
+            elif kind == 'hexbin':
+                ok = (indices[i] >= 0) & (indices[j] >= 0)
+                ax.hexbin(values[ok, j], values[ok, i], gridsize=bins // 2, cmap=cmap, bins='log', mincnt=1,
+                          extent=(*ranges[j], *ranges[i]), rasterized=True)
+            else:
+                # Les panneaux (i, j) et (j, i) sont transposés l'un de l'autre : un seul comptage par paire
+                if (j, i) in pair_counts:
+                    counts = pair_counts.pop((j, i)).T
+                else:
+                    ok = (indices[i] >= 0) & (indices[j] >= 0)
+                    counts = np.bincount(indices[i][ok] * bins + indices[j][ok], minlength=bins * bins).reshape(bins, bins)
+                    pair_counts[(i, j)] = counts
+                ax.imshow(np.ma.masked_equal(counts, 0), origin='lower', aspect='auto', cmap=cmap,
+                          norm=LogNorm(vmin=1, vmax=max(counts.max(), 1)), interpolation='nearest',
+                          extent=(*ranges[j], *ranges[i]))
+            ax.set_xlim(ranges[j])
+            if i != j:
+                ax.set_ylim(ranges[i])
+            # Étiquettes sur le bord de la matrice uniquement, comme scatter_matrix
+            ax.set_xlabel(df.columns[j] if i == n_cols - 1 else '')
+            ax.set_ylabel(df.columns[i] if j == 0 else '')
+            if i < n_cols - 1:
+                ax.set_xticklabels([])
+            if j > 0:
+                ax.set_yticklabels([])
+    return axes
+
+
+
+
+if __name__ == "__main__":
+    mpl.use('Agg')
+    # Rendements corrélés de 12 instruments : temps de rendu (figure enregistrée en PNG) selon le nombre de points
+    rng = np.random.default_rng(1000)
+    n_cols = 12
+    corr = 0.5 * np.eye(n_cols) + 0.5
+    chol = np.linalg.cholesky(corr)
+
+    def render(plot, rets):
+        t0 = time.perf_counter()
+        plot(rets)
+        plt.savefig(io.BytesIO(), format='png', dpi=100)
+        plt.close('all')
+        return time.perf_counter() - t0
+
+    print(f"{'Points':>10} {'scatter_matrix (s)':>19} {'densité (s)':>12} {'hexbin (s)':>11}")
+    for n in [10_000, 100_000, 1_000_000]:
+        rets = pd.DataFrame(rng.standard_t(4, (n, n_cols)) @ chol.T * 1e-3, columns=[f'R{k}' for k in range(n_cols)])
+        t_scatter = render(lambda r: pd.plotting.scatter_matrix(r, alpha=0.2, diagonal='hist', figsize=(10, 6)), rets) if n <= 10_000 else np.nan
+        t_density = render(density_scatter_matrix, rets)
+        t_hexbin = render(lambda r: density_scatter_matrix(r, kind='hexbin'), rets)
+        print(f"{n:>10} {t_scatter:>19.2f} {t_density:>12.2f} {t_hexbin:>11.2f}")
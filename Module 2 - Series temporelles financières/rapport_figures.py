@@ -0,0 +1,205 @@
+'''
+Module 2 - Financial Time Series
+rapport_figures :
+
+Mode rapport sans affichage (headless) et rendu parallèle des figures.
+
+Les scripts enchaînent plt.savefig(...) puis un plt.show() bloquant pour chaque figure, une à la fois, et ceux du Module 1
+ouvrent un navigateur pour chaque graphique Plotly (auto_open=True). Pour un rapport nocturne de plusieurs centaines de
+graphiques :
+- la variable d'environnement RAPPORT_HEADLESS=1 active le backend Agg : show() ferme la figure au lieu de l'afficher,
+  et les scripts Plotly n'ouvrent plus le navigateur
+- les figures indépendantes sont rendues en parallèle dans un pool de processus (render_figures)
+- chaque figure est associée à l'empreinte (SHA-256) de ses données d'entrée et du code qui la trace :
+  une figure dont l'empreinte n'a pas changé depuis le rendu précédent n'est pas recalculée
+
+Utilisation :
+    python rapport_figures.py                      # statistiques mobiles et SMA pour les 12 instruments (yfinance)
+    python rapport_figures.py --synthetique 300    # 300 instruments synthétiques (hors ligne)
+    python rapport_figures.py --scripts            # exécute tous les scripts des Modules 1 et 2 en mode headless
+'''
+
+
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+import inspect
+import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import matplotlib as mpl
+
+HEADLESS = os.environ.get('RAPPORT_HEADLESS') == '1'
+if HEADLESS:
+    mpl.use('Agg')
+import matplotlib.pyplot as plt
+
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+FIGURES_DIR = os.path.join(MODULE_DIR, 'Figures_series_temporelles_financieres')
+CACHE_FILE = os.path.join(FIGURES_DIR, '.cache_figures.json')
+os.makedirs(FIGURES_DIR, exist_ok=True)
+
+
+def show():
+    '''Remplace plt.show() dans les scripts : affiche la figure, ou la ferme en mode headless (aucun blocage).'''
+    if HEADLESS:
+        plt.close('all')
+    else:
+        plt.show()
+
+
+
+
+# =====================================================================================================
+# Figures du rapport : fonctions de module (transmissibles aux processus), données en entrée, figure en sortie
+# =====================================================================================================
+
+def plot_rolling_statistics(prices, sym, window=20, last=200):
+    '''Prix et bandes min / moyenne / max mobiles sur les last dernières observations.'''
+    data = pd.DataFrame({sym: prices})
+    rolling = data[sym].rolling(window=window)
+    data['min'], data['mean'], data['max'] = rolling.min(), rolling.mean(), rolling.max()
+    ax = data[['min', 'mean', 'max']].iloc[-last:].plot(figsize=(10, 6), style=['g--', 'r--', 'g--'], lw=0.8)
+    data[sym].iloc[-last:].plot(ax=ax, lw=2.0)
+    ax.set_title(f'Prix de {sym} et statistiques mobiles ({window} jours)')
+    return ax.figure
+
+def plot_sma_positions(prices, sym, short=42, long=252):
+    '''Prix, SMA courte et longue, et positions longues / courtes issues de leur croisement.'''
+    data = pd.DataFrame({sym: prices})
+    data['SMA1'] = data[sym].rolling(window=short).mean()
+    data['SMA2'] = data[sym].rolling(window=long).mean()
+    data.dropna(inplace=True)
+    data['positions'] = np.where(data['SMA1'] > data['SMA2'], 1, -1)
+    ax = data[[sym, 'SMA1', 'SMA2', 'positions']].plot(figsize=(10, 6), secondary_y='positions')
+    ax.set_title(f'Prix de {sym}, SMA {short} / {long} jours et positions')
+    return ax.figure
+
+
+
+
+# =====================================================================================================
+# Rendu parallèle avec cache par empreinte des entrées
+# =====================================================================================================
+
+def inputs_hash(func, args, kwargs):
+    '''Empreinte SHA-256 du code de la fonction de tracé et de ses arguments (sérialisés par pickle).'''
+    digest = hashlib.sha256(inspect.getsource(func).encode())
+    digest.update(pickle.dumps((args, sorted(kwargs.items())), protocol=4))
+    return digest.hexdigest()
+
+def _render_job(path, func, args, kwargs):
+    # Chaque processus trace sans affichage, quel que soit le mode du processus parent
+    plt.switch_backend('Agg')
+    plt.style.use('seaborn-v0_8')
+    mpl.rcParams['font.family'] = 'serif'
+    fig = func(*args, **kwargs)
+    fig.tight_layout()
+    fig.savefig(path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+def render_figures(jobs, workers=None, cache_file=CACHE_FILE):
+    '''
+    Rend les figures jobs = [(fichier, fonction, args, kwargs), ...] dans un pool de processus.
+    Les figures dont le fichier existe et dont l'empreinte des entrées est inchangée sont sautées.
+    Retourne la liste des fichiers rendus et celle des fichiers sautés.
+    '''
+    cache = {}
+    if cache_file and os.path.exists(cache_file):
+        with open(cache_file, encoding='utf-8') as f:
+            cache = json.load(f)
+
+    todo, skipped, hashes = [], [], {}
+    for path, func, args, kwargs in jobs:
+        hashes[path] = inputs_hash(func, args, kwargs)
+        if cache.get(path) == hashes[path] and os.path.exists(path):
+            skipped.append(path)
+        else:
+            todo.append((path, func, args, kwargs))
+
+    # Chaque figure terminée entre dans le cache, et le cache est écrit même si une figure échoue :
+    # le lancement suivant ne refait que les figures en échec. La première erreur est relevée à la fin.
+    rendered, error = [], None
+    try:
+        if todo:
+            with ProcessPoolExecutor(workers) as pool:
+                for future in as_completed([pool.submit(_render_job, *job) for job in todo]):
+                    try:
+                        path = future.result()
+                    except Exception as exc:
+                        error = error or exc
+                        continue
+                    rendered.append(path)
+                    cache[path] = hashes[path]
+        if error is not None:
+            raise error
+    finally:
+        if cache_file:
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=1)
+    return rendered, skipped
+
+def run_scripts(scripts, workers=None):
+    '''
+    Exécute des scripts en mode headless dans des processus parallèles, depuis la racine du dépôt.
+    Retourne {script: (code de sortie, dernière ligne d'erreur)}.
+    '''
+    env = dict(os.environ, RAPPORT_HEADLESS='1', MPLBACKEND='Agg')
+    root = os.path.dirname(MODULE_DIR)
+
+    def run(script):
+        result = subprocess.run([sys.executable, script], cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        return result.returncode, (result.stderr.strip().splitlines() or [''])[-1]
+
+    with ThreadPoolExecutor(workers or os.cpu_count()) as pool:
+        return dict(zip(scripts, pool.map(run, scripts)))
+
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Rapport de figures sans affichage, rendu en parallèle avec cache')
+    parser.add_argument('--workers', type=int, default=None, help='nombre de processus (un par cœur par défaut)')
+    parser.add_argument('--synthetique', type=int, metavar='N', help='N instruments synthétiques au lieu de yfinance')
+    parser.add_argument('--scripts', action='store_true', help='exécute les scripts des Modules 1 et 2 en mode headless')
+    args = parser.parse_args()
+
+    if args.scripts:
+        root = os.path.dirname(MODULE_DIR)
+        scripts = sorted(os.path.join(folder, name) for folder in ['Module 1 - Visualisation des données', 'Module 2 - Series temporelles financières']
+                         for name in os.listdir(os.path.join(root, folder)) if name[0].isdigit() and name.endswith('.py'))
+        t0 = time.time()
+        for script, (code, error) in run_scripts(scripts, args.workers).items():
+            print(f'OK     {script}' if code == 0 else f'ÉCHEC  {script} : {error}')
+        print(f'{len(scripts)} scripts exécutés en {time.time() - t0:.1f} secondes')
+        sys.exit(0)
+
+    if args.synthetique:
+        # Séries de prix synthétiques sur 10 ans de jours ouvrés
+        index = pd.date_range('2016-01-01', periods=2600, freq='B')
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame(100 * np.exp(rng.standard_normal((len(index), args.synthetique)).cumsum(axis=0) * 0.01),
+                            index=index, columns=[f'SYN{k:04d}' for k in range(args.synthetique)])
+    else:
+        import yfinance as yf
+        tickers = ['AAPL', 'MSFT', 'INTC', 'AMZN', 'GS', 'SPY', '^GSPC', '^VIX', 'EURUSD=X', 'GC=F', 'GDX', 'GLD']
+        data = yf.download(tickers, start='2016-01-01', end='2026-01-01', auto_adjust=True)['Close']
+
+    jobs = []
+    for sym in data.columns:
+        prices = data[sym].dropna()
+        name = ''.join(c if c.isalnum() else '_' for c in sym)
+        jobs.append((os.path.join(FIGURES_DIR, f'rapport_{name}_statistiques_mobiles.png'), plot_rolling_statistics, (prices, sym), {}))
+        jobs.append((os.path.join(FIGURES_DIR, f'rapport_{name}_SMA_positions.png'), plot_sma_positions, (prices, sym), {}))
+
+    t0 = time.time()
+    rendered, skipped = render_figures(jobs, args.workers)
+    print(f'{len(jobs)} figures : {len(rendered)} rendues, {len(skipped)} inchangées (cache), {time.time() - t0:.1f} secondes')